@@ -1,26 +1,79 @@
 from pathlib import Path
+from typing import Optional
+from PySide6.QtCore import QThread, Signal
 from src.services.backup import resolve_backup_root
 from src.services.logger import setup_logger
 from src.db.connection import connect_sqlite
-from src.db.schema import ensure_schema
+from src.db.schema import ensure_schema, seed_catalogs
 from src.app.state import AppState
 
-def _attach_base_catalog(conn, base_db_path: Path, log):
+def _attach_base_catalog(conn, base_db_path: Path, log, exists: Optional[bool] = None):
     # Attach as read-mostly catalog DB for fast search without copying into main DB.
     # We intentionally avoid any writes to this attached DB.
-    if not base_db_path.exists():
+    if exists is None:
+        exists = base_db_path.is_file()
+    if not exists:
         log.warning("foods_base.db not found at %s (catalog features may be limited)", base_db_path)
         return
     try:
-        # If already attached, skip
-        rows = conn.execute("PRAGMA database_list").fetchall()
-        if any(r[1] == "base" for r in rows):
+        # If already attached, skip. Connections from connect_sqlite carry a
+        # flag; only unknown connection types need the PRAGMA scan.
+        attached = getattr(conn, "base_attached", None)
+        if attached:
             return
-        p = str(base_db_path).replace("'", "''")
-        conn.execute(f"ATTACH DATABASE '{p}' AS base")
+        if attached is None:
+            rows = conn.execute("PRAGMA database_list").fetchall()
+            if any(r[1] == "base" for r in rows):
+                return
+        # Shipped asset never changes: attach read-only + immutable so SQLite
+        # skips locking/change detection, and serve its pages via mmap.
+        uri = f"{base_db_path.absolute().as_uri()}?mode=ro&immutable=1"
+        conn.execute("ATTACH DATABASE ? AS base", (uri,))
+        if attached is not None:
+            conn.base_attached = True
+        conn.execute("PRAGMA base.mmap_size=268435456")
     except Exception as e:
         log.warning("Failed to ATTACH base catalog: %s", e)
 
+class FoodsSeedThread(QThread):
+    """Seeds the embedded food catalogs on a dedicated connection so the
+    splash/main window is not blocked by CSV parsing and bulk INSERTs."""
+
+    seedingFinished = Signal()
+
+    def __init__(self, db_path: Path, log, base_db_path: Optional[Path] = None,
+                 base_exists: Optional[bool] = None, parent=None):
+        super().__init__(parent)
+        self._db_path = db_path
+        self._log = log
+        self._base_db_path = base_db_path
+        self._base_exists = base_exists
+        # Set in run() just before seedingFinished is emitted. isFinished() only
+        # turns true later, so a listener connecting in between checks this flag.
+        self.done = False
+
+    def run(self) -> None:
+        conn = None
+        try:
+            conn = connect_sqlite(self._db_path)
+            seed_catalogs(conn, self._base_db_path, self._base_exists)
+        except Exception as e:
+            self._log.warning("Food catalog seeding failed: %s", e)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self.done = True
+            self.seedingFinished.emit()
+
+def seed_foods_async(db_path: Path, log, base_db_path: Optional[Path] = None,
+                     base_exists: Optional[bool] = None) -> FoodsSeedThread:
+    thread = FoodsSeedThread(db_path, log, base_db_path, base_exists)
+    thread.start()
+    return thread
+
 def bootstrap() -> tuple[AppState, object]:
     backup_root = resolve_backup_root()
     log = setup_logger(backup_root / "logs")
@@ -30,12 +83,17 @@ def bootstrap() -> tuple[AppState, object]:
     ensure_schema(conn)
 
     # Resolve embedded base catalog path (src/assets/data/foods_base.db)
+    # once; the existence check is shared with the seeder and AppState.
     src_root = Path(__file__).resolve().parents[1]  # .../src
     foods_base_db_path = src_root / "assets" / "data" / "foods_base.db"
-    _attach_base_catalog(conn, foods_base_db_path, log)
+    foods_base_exists = foods_base_db_path.is_file()
+
+    seed_thread = seed_foods_async(db_path, log, foods_base_db_path, foods_base_exists)
+    _attach_base_catalog(conn, foods_base_db_path, log, foods_base_exists)
 
     log.info("Backup root: %s", backup_root)
     log.info("DB path: %s", db_path)
 
-    state = AppState(backup_root=backup_root, db_path=db_path, conn=conn, foods_base_db_path=foods_base_db_path)
+    state = AppState(backup_root=backup_root, db_path=db_path, conn=conn, foods_base_db_path=foods_base_db_path,
+                     foods_base_exists=foods_base_exists, seed_thread=seed_thread)
     return state, log
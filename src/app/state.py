@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 import sqlite3
 from pathlib import Path
+from typing import Optional
 
 @dataclass
 class AppState:
@@ -8,3 +9,6 @@ class AppState:
     db_path: Path
     conn: sqlite3.Connection
     foods_base_db_path: Path
+    foods_base_exists: bool = False
+    # Background catalog seeding thread (QThread); emits seedingFinished.
+    seed_thread: Optional[object] = None
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Optional
+import sys
+
+# Python 3.11+ fromisoformat accepts a trailing "Z" natively.
+_HAS_ISO_Z = sys.version_info >= (3, 11)
 
 def _try_parse(s: str) -> Optional[datetime]:
     # be defensive: callers may pass dict/objects
@@ -21,37 +26,106 @@ def _try_parse(s: str) -> Optional[datetime]:
     s = s.strip()
     if not s:
         return None
-    # Common formats stored in app
-    fmts = [
-        "%Y-%m-%d",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S.%f",
-        "%Y-%m-%d %H:%M:%S",
-        "%d.%m.%Y",
-        "%d.%m.%Y %H:%M",
-    ]
-    for fmt in fmts:
+    return _parse_cached(s)
+
+def _parse_tr(s: str) -> Optional[datetime]:
+    """Fast path for zero-padded DD.MM.YYYY[ HH:MM] without strptime."""
+    n = len(s)
+    if n not in (10, 16) or s[2] != "." or s[5] != ".":
+        return None
+    try:
+        if n == 16:
+            if s[10] != " " or s[13] != ":":
+                return None
+            return datetime(int(s[6:10]), int(s[3:5]), int(s[0:2]), int(s[11:13]), int(s[14:16]))
+        return datetime(int(s[6:10]), int(s[3:5]), int(s[0:2]))
+    except ValueError:
+        return None
+
+_ISO_FALLBACK_FMTS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+@lru_cache(maxsize=4096)
+def _parse_cached(s: str) -> Optional[datetime]:
+    # List views repeat the same handful of dates across many rows; only
+    # hashable, already-normalized strings reach this cache.
+
+    # Stored values are ISO-style (YYYY-MM-DD[ T]HH:MM[:SS[.ffffff]]);
+    # fromisoformat is C-implemented and far cheaper than strptime.
+    try:
+        if s[-1] == "Z" and not _HAS_ISO_Z:
+            s = s[:-1] + "+00:00"
+        return datetime.fromisoformat(s)
+    except ValueError:
+        pass
+    if "Z" in s:
+        # Basic-format ISO with a "Z" zone (e.g. "20240105Z") needs an explicit offset.
+        try:
+            return datetime.fromisoformat(s.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    # ISO variants fromisoformat rejects (non-zero-padded, e.g. "2024-1-5 9:05")
+    for fmt in _ISO_FALLBACK_FMTS:
         try:
             return datetime.strptime(s, fmt)
         except ValueError:
             continue
-    # Last resort: datetime.fromisoformat (handles many ISO variants)
-    try:
-        return datetime.fromisoformat(s.replace("Z", "+00:00"))
-    except Exception:
-        return None
+    # Turkish display formats (manual entry / legacy rows)
+    dt = _parse_tr(s)
+    if dt is not None:
+        return dt
+    for fmt in ("%d.%m.%Y", "%d.%m.%Y %H:%M"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    return None
+
+def parse_db_datetime(raw: bytes):
+    """sqlite3 converter for `AS "col [dt]"` column hints.
 
-def format_tr_date(value: str) -> str:
-    """Return DD.MM.YYYY for a stored date string; if cannot parse, return original."""
+    Returns a datetime when the stored text parses, otherwise the original
+    string so no data is lost for display.
+    """
+    s = raw.decode("utf-8", "replace")
+    dt = _try_parse(s)
+    return dt if dt is not None else s
+
+def format_tr_date(value: str | datetime | date) -> str:
+    """Return DD.MM.YYYY for a stored date string or datetime/date; if cannot parse, return original."""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d.%m.%Y")
+    if isinstance(value, str):
+        fast = _format_iso_date_fast(value)
+        if fast is not None:
+            return fast
     dt = _try_parse(value)
     if not dt:
         return value
     return dt.strftime("%d.%m.%Y")
 
-def format_tr_datetime(value: str) -> str:
-    """Return DD.MM.YYYY HH:MM for a stored datetime string; if cannot parse, return original."""
+def _format_iso_date_fast(s: str) -> Optional[str]:
+    """Plain stored YYYY-MM-DD -> DD.MM.YYYY by slicing, without a datetime round trip."""
+    if (len(s) != 10 or not s.isascii() or s[4] != "-" or s[7] != "-" or s[0] == "0"
+            or not (s[0:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit())):
+        return None
+    try:
+        # Only validates the calendar date (e.g. rejects 2024-02-30).
+        date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+    except ValueError:
+        return None
+    return f"{s[8:10]}.{s[5:7]}.{s[0:4]}"
+
+def format_tr_datetime(value: str | datetime | date) -> str:
+    """Return DD.MM.YYYY HH:MM for a stored datetime string or datetime/date; if cannot parse, return original."""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d.%m.%Y %H:%M")
     dt = _try_parse(value)
     if not dt:
         return value
-    return dt.strftime("%d.%m.%Y %H:%M")
\ No newline at end of file
+    return dt.strftime("%d.%m.%Y %H:%M")
@@ -1,14 +1,51 @@
 import sqlite3
 from pathlib import Path
 
-def connect_sqlite(db_path: Path) -> sqlite3.Connection:
+from src.app.utils.dates import parse_db_datetime
+
+# Tarih kolonları TEXT olarak saklanır; sorguda `AS "col [dt]"` ipucu verilen
+# kolonlar bir kez parse edilip datetime olarak döner (PARSE_COLNAMES).
+sqlite3.register_converter("dt", parse_db_datetime)
+
+class AppConnection(sqlite3.Connection):
+    # sqlite3.Connection does not accept ad-hoc attributes; this subclass carries
+    # per-connection flags (e.g. whether the base catalog is attached).
+    base_attached: bool = False
+    # (has created_at, has updated_at) for the clients table; filled on first
+    # ClientsService use (schema migrations run before any service is built).
+    clients_cols: "tuple[bool, bool] | None" = None
+
+def connect_sqlite(db_path: Path, synchronous: str = "NORMAL") -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path.as_posix(), check_same_thread=False)
+    # uri=True: ATTACH'ta salt-okunur/immutable URI kullanabilmek için (ör. foods_base.db).
+    # Düz dosya yolları URI modunda da aynen çalışır.
+    conn = sqlite3.connect(
+        db_path.as_posix(), check_same_thread=False, uri=True, factory=AppConnection,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+    )
     conn.row_factory = sqlite3.Row
 
-    # Dayanıklılık ayarları (elektrik kesintisi/çökme senaryosu)
-    # WAL: daha güvenli + performans iyi
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA synchronous=FULL;")  # güvenlik > performans
-    conn.execute("PRAGMA foreign_keys=ON;")
+    # Dayanıklılık + performans ayarları (elektrik kesintisi/çökme senaryosu)
+    # WAL: daha güvenli + performans iyi. WAL modunda synchronous=NORMAL
+    # çökme sonrası bozulmaya yol açmaz; en fazla son commit kaybolabilir.
+    # Maksimum güvenlik isteyenler synchronous="FULL" verebilir.
+    if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        synchronous = "NORMAL"
+    conn.executescript(
+        f"""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous={synchronous.upper()};
+        PRAGMA foreign_keys=ON;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA busy_timeout=5000;
+        PRAGMA wal_autocheckpoint=1000;
+        """
+    )
+    # Sorgu planlayıcı istatistiklerini gerektiğinde güncelle (ucuz; değişiklik yoksa iş yapmaz)
+    try:
+        conn.execute("PRAGMA optimize=0x10002;")
+    except sqlite3.Error:
+        pass
     return conn
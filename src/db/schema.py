@@ -170,6 +170,8 @@ CREATE TABLE IF NOT EXISTS appointments (
 );
 CREATE INDEX IF NOT EXISTS idx_appointments_client_date ON appointments(client_id, starts_at);
 CREATE INDEX IF NOT EXISTS idx_appointments_status ON appointments(status, starts_at);
+-- Takvim/gün sorguları: is_active=1 AND starts_at aralığı (substr yerine range).
+CREATE INDEX IF NOT EXISTS idx_appointments_active_starts ON appointments(is_active, starts_at);
 
 -- Ölçümler (danışan bazlı, çoklu kayıt)
 
@@ -254,15 +256,21 @@ CREATE TABLE IF NOT EXISTS meal_templates (
 
 
 from pathlib import Path
+from typing import Optional
+
+TR_CORE_CATALOG_VERSION = "v2-tr-core"
 
 def seed_tr_core_curated(conn: sqlite3.Connection) -> None:
-    """Force-apply Kurumsal TR çekirdek katalog to foods_curated.
+    """Apply Kurumsal TR çekirdek katalog to foods_curated.
 
     This is a deterministic, offline seed from an embedded CSV file.
-    It wipes foods_curated to guarantee a clean, Turkish-only catalog.
+    Steady-state installs (catalog_version already current) return early.
+    Otherwise rows are upserted by a deterministic id (name + category) and
+    rows no longer in the CSV are removed, keeping a clean, Turkish-only catalog.
     """
     from pathlib import Path
     import csv
+    import hashlib
     from datetime import datetime
 
     # Ensure table exists
@@ -284,13 +292,23 @@ def seed_tr_core_curated(conn: sqlite3.Connection) -> None:
     );
     """)
 
+    ver = conn.execute("SELECT value FROM foods_catalog_meta WHERE key='catalog_version'").fetchone()
+    if ver and ver[0] == TR_CORE_CATALOG_VERSION:
+        has_rows = conn.execute("SELECT 1 FROM foods_curated WHERE is_active=1 LIMIT 1").fetchone()
+        # Aynı (ad, kategori) iki kez varsa (eski eşzamanlı seed kalıntısı) yeniden uygula:
+        # deterministik id'ler korunur, diğerleri stale olarak silinir.
+        has_dupes = conn.execute(
+            "SELECT 1 FROM foods_curated GROUP BY name, category HAVING COUNT(1) > 1 LIMIT 1"
+        ).fetchone()
+        if has_rows and not has_dupes:
+            return
+
     csv_path = Path(__file__).resolve().parents[1] / "assets" / "data" / "kurumsal_tr_cekirdek_catalog.csv"
     if not csv_path.exists():
         return
 
-    conn.execute("DELETE FROM foods_curated")
-
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
     with open(csv_path, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -303,17 +321,46 @@ def seed_tr_core_curated(conn: sqlite3.Connection) -> None:
                 kcal_val = float(kcal)
             except Exception:
                 kcal_val = 0.0
-            food_id = conn.execute("SELECT lower(hex(randomblob(16)))").fetchone()[0]
-            conn.execute(
-                """INSERT INTO foods_curated (id,name,kcal_per_100g,is_active,created_at,updated_at,category)
-                VALUES (?,?,?,?,?,?,?)""",
-                (food_id, name, kcal_val, 1, now, now, cat),
-            )
+            food_id = hashlib.sha1(f"{cat}\x1f{name}".encode("utf-8")).hexdigest()[:32]
+            rows.append((food_id, name, kcal_val, 1, now, now, cat))
+
+    keep_ids = {r[0] for r in rows}
 
-    conn.execute("INSERT OR REPLACE INTO foods_catalog_meta (key,value) VALUES ('catalog_source','Kurumsal TR Çekirdek')")
-    conn.execute("INSERT OR REPLACE INTO foods_catalog_meta (key,value) VALUES ('catalog_version','v2-tr-core')")
+    # Tek transaction: sadece değişen satırlar yazılır, CSV'de olmayanlar silinir.
+    # BEGIN IMMEDIATE: mevcut id'ler yazma kilidi alındıktan sonra okunur, böylece
+    # başka bir bağlantının araya giren yazması stale listesini eskitemez.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        existing_ids = {r[0] for r in conn.execute("SELECT id FROM foods_curated")}
+        stale_ids = [(i,) for i in existing_ids - keep_ids]
+        cur = conn.cursor()
+        cur.executemany("DELETE FROM foods_curated WHERE id=?", stale_ids)
+        cur.executemany(
+            """INSERT INTO foods_curated (id,name,kcal_per_100g,is_active,created_at,updated_at,category)
+            VALUES (?,?,?,?,?,?,?)
+            ON CONFLICT(id) DO UPDATE SET
+              name=excluded.name,
+              kcal_per_100g=excluded.kcal_per_100g,
+              is_active=1,
+              updated_at=excluded.updated_at,
+              category=excluded.category
+            WHERE foods_curated.name IS NOT excluded.name
+               OR foods_curated.kcal_per_100g IS NOT excluded.kcal_per_100g
+               OR foods_curated.is_active IS NOT 1
+               OR foods_curated.category IS NOT excluded.category""",
+            rows,
+        )
+        cur.executemany(
+            "INSERT OR REPLACE INTO foods_catalog_meta (key,value) VALUES (?,?)",
+            [("catalog_source", "Kurumsal TR Çekirdek"), ("catalog_version", TR_CORE_CATALOG_VERSION)],
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
-def seed_foods_catalog(conn: sqlite3.Connection) -> None:
+def seed_foods_catalog(conn: sqlite3.Connection, base_db: Optional[Path] = None,
+                       base_exists: Optional[bool] = None) -> None:
     """Seed foods_catalog from embedded base DB if catalog is empty.
 
     This avoids runtime CSV imports (freeze risk) and guarantees thousands of foods
@@ -330,8 +377,12 @@ def seed_foods_catalog(conn: sqlite3.Connection) -> None:
         return
 
     # Embedded base DB path: src/assets/data/foods_base.db
-    base_db = Path(__file__).resolve().parents[1] / "assets" / "data" / "foods_base.db"
-    if not base_db.exists():
+    # bootstrap() resolves/stats it once and passes the result in.
+    if base_db is None:
+        base_db = Path(__file__).resolve().parents[1] / "assets" / "data" / "foods_base.db"
+    if base_exists is None:
+        base_exists = base_db.is_file()
+    if not base_exists:
         return
 
     # IMPORTANT: SQLite cannot DETACH within an open transaction.
@@ -344,21 +395,20 @@ def seed_foods_catalog(conn: sqlite3.Connection) -> None:
         conn.execute("ATTACH DATABASE ? AS base", (str(base_db),))
         attached = True
 
-        # Copy foods and meta
-        conn.execute(
-            "INSERT OR REPLACE INTO foods_catalog(id,name,kcal_per_100g,is_active,created_at,updated_at) "
-            "SELECT id,name,kcal_per_100g,is_active,created_at,updated_at FROM base.foods_catalog"
-        )
-        try:
+        # Copy foods and meta inside one explicit transaction so the WAL is
+        # flushed once; `with conn` commits BEFORE we detach below.
+        with conn:
             conn.execute(
-                "INSERT OR REPLACE INTO foods_catalog_meta(key,value) "
-                "SELECT key,value FROM base.foods_catalog_meta"
+                "INSERT OR REPLACE INTO foods_catalog(id,name,kcal_per_100g,is_active,created_at,updated_at) "
+                "SELECT id,name,kcal_per_100g,is_active,created_at,updated_at FROM base.foods_catalog"
             )
-        except Exception:
-            pass
-
-        # End implicit transaction BEFORE detaching.
-        conn.commit()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO foods_catalog_meta(key,value) "
+                    "SELECT key,value FROM base.foods_catalog_meta"
+                )
+            except Exception:
+                pass
     finally:
         if attached:
             try:
@@ -373,17 +423,28 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     # --- Lightweight, backwards-compatible migrations ---
     # SQLite doesn't support ALTER TABLE ... ADD COLUMN IF NOT EXISTS,
     # so we probe PRAGMA table_info and add missing columns when needed.
+    # Column sets are cached per table so each table is probed only once.
+    cols_cache: dict[str, set[str]] = {}
+
     def _has_column(table: str, column: str) -> bool:
-        try:
-            cur = conn.execute(f"PRAGMA table_info({table})")
-            cols = [r[1] for r in cur.fetchall()]  # (cid, name, type, notnull, dflt_value, pk)
-            return column in cols
-        except Exception:
-            return False
+        cols = cols_cache.get(table)
+        if cols is None:
+            try:
+                cur = conn.execute(f"PRAGMA table_info({table})")
+                cols = {r[1] for r in cur.fetchall()}  # (cid, name, type, notnull, dflt_value, pk)
+            except Exception:
+                return False
+            cols_cache[table] = cols
+        return column in cols
+
+    # ALTERs (and their follow-up backfills) are queued and applied together in
+    # one explicit transaction below, so the WAL is flushed once.
+    pending_alters: list[str] = []
+    pending_updates: list[str] = []
 
     def _add_column(table: str, ddl_fragment: str) -> None:
         # ddl_fragment example: "plan_text TEXT NOT NULL DEFAULT ''"
-        conn.execute(f"ALTER TABLE {table} ADD COLUMN {ddl_fragment}")
+        pending_alters.append(f"ALTER TABLE {table} ADD COLUMN {ddl_fragment}")
 
     
     # Sprint 5.0 - Besin Tüketimi: satır sırası için display_order
@@ -423,19 +484,65 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
         _add_column('meal_templates', "content TEXT NOT NULL DEFAULT ''")
         # If older schema had items_json, preserve it into content as a fallback
         if _has_column('meal_templates', 'items_json'):
-            try:
-                conn.execute("UPDATE meal_templates SET content=items_json WHERE (content='' OR content IS NULL) AND (items_json IS NOT NULL AND items_json!='')")
-            except Exception:
-                pass
+            pending_updates.append("UPDATE meal_templates SET content=items_json WHERE (content='' OR content IS NULL) AND (items_json IS NOT NULL AND items_json!='')")
 
     if not _has_column('meal_templates', 'updated_at'):
         _add_column('meal_templates', "updated_at TEXT NOT NULL DEFAULT ''")
+        pending_updates.append("UPDATE meal_templates SET updated_at=created_at WHERE (updated_at='' OR updated_at IS NULL) AND (created_at IS NOT NULL AND created_at!='')")
+
+    if pending_alters:
+        conn.execute("BEGIN")
         try:
-            conn.execute("UPDATE meal_templates SET updated_at=created_at WHERE (updated_at='' OR updated_at IS NULL) AND (created_at IS NOT NULL AND created_at!='')")
+            for stmt in pending_alters:
+                conn.execute(stmt)
+            for stmt in pending_updates:
+                try:
+                    conn.execute(stmt)
+                except Exception:
+                    pass
+            conn.commit()
         except Exception:
-            pass
-
-    seed_foods_catalog(conn)
-    seed_tr_core_curated(conn)
+            conn.rollback()
+            raise
+
+    # Covering indexes (created after migrations: display_order may have just
+    # been added). Daily kcal sums and weight trend charts are answered from
+    # the index alone, without table lookups. The partial appointments index
+    # (needs the migrated `notified` column) serves the reminder poll.
+    conn.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_food_entries_cover
+      ON food_consumption_entries(client_id, entry_date, meal_type, kcal_total, display_order);
+    CREATE INDEX IF NOT EXISTS idx_measurements_cover
+      ON measurements(client_id, measured_at, created_at, weight_kg, body_fat_percent);
+    CREATE INDEX IF NOT EXISTS idx_appointments_pending
+      ON appointments(starts_at) WHERE is_active=1 AND notified=0;
+    """)
 
-    conn.commit()
\ No newline at end of file
+    # Autosave: one draft per (entity_type, entity_id, client_id), enforced by a
+    # UNIQUE expression index so upsert_draft can use ON CONFLICT. Older DBs
+    # may still hold duplicates; keep the newest row per key before indexing.
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_autosave_key'"
+    ).fetchone():
+        conn.executescript("""
+        DELETE FROM autosave_drafts WHERE id NOT IN (
+          SELECT max(id) FROM autosave_drafts
+           GROUP BY entity_type, IFNULL(entity_id,''), IFNULL(client_id,''));
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_autosave_key
+          ON autosave_drafts(entity_type, IFNULL(entity_id,''), IFNULL(client_id,''));
+        """)
+
+    # Catalog seeding is NOT done here: it runs off the startup thread via
+    # seed_catalogs() (see src/app/bootstrap.py::seed_foods_async).
+    conn.commit()
+
+
+def seed_catalogs(conn: sqlite3.Connection, base_db: Optional[Path] = None,
+                  base_exists: Optional[bool] = None) -> None:
+    """Seed the embedded food catalogs (foods_catalog + foods_curated).
+
+    Intended to run on its own connection in a background thread; WAL mode lets
+    the UI keep reading the previous snapshot until the seed commits.
+    """
+    seed_foods_catalog(conn, base_db, base_exists)
+    seed_tr_core_curated(conn)
\ No newline at end of file
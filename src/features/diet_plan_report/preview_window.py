@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
 from typing import Optional
 
@@ -22,6 +23,8 @@ class DietPlanPdfPreviewWindow(QDialog):
         self._client = client
         self._plan = plan
         self._fmt_date_ui = fmt_date_ui
+        # Payload is built once (in _render_to_temp) and shared with save-as.
+        self._payload: Optional[dict] = None
 
         root = QVBoxLayout(self)
 
@@ -49,23 +52,19 @@ class DietPlanPdfPreviewWindow(QDialog):
 
     def _render_to_temp(self) -> Optional[str]:
         try:
-            payload = build_payload(client=self._client, plan=self._plan, fmt_date_ui=self._fmt_date_ui)
+            self._payload = build_payload(client=self._client, plan=self._plan, fmt_date_ui=self._fmt_date_ui)
             out_dir = os.path.join(tempfile.gettempdir(), "NutriNexus")
             os.makedirs(out_dir, exist_ok=True)
             plan_id = getattr(self._plan, "id", "x")
             client_name = (self._client.get("full_name") or "client").strip().replace(" ", "_")
             tmp_path = os.path.join(out_dir, f"diet_plan_preview_{client_name}_{plan_id}.pdf")
-            build_diet_plan_pdf(tmp_path, payload)
+            build_diet_plan_pdf(tmp_path, self._payload)
             return tmp_path
         except Exception as e:
             QMessageBox.warning(self, "Önizleme", f"PDF oluşturulamadı:\n{e}")
             return None
 
     def _save_as(self):
-        if not self._tmp_pdf or not os.path.exists(self._tmp_pdf):
-            QMessageBox.warning(self, "PDF", "Önce PDF üretilemedi.")
-            return
-
         default_name = "diyet_plani.pdf"
         title = getattr(self._plan, "title", "") or ""
         if title.strip():
@@ -80,8 +79,13 @@ class DietPlanPdfPreviewWindow(QDialog):
             target += ".pdf"
 
         try:
-            payload = build_payload(client=self._client, plan=self._plan, fmt_date_ui=self._fmt_date_ui)
-            build_diet_plan_pdf(target, payload)
+            if self._tmp_pdf and os.path.exists(self._tmp_pdf):
+                # Önizleme PDF'i aynı payload ile üretildi: yeniden render etmek yerine kopyala.
+                shutil.copyfile(self._tmp_pdf, target)
+            else:
+                if self._payload is None:
+                    self._payload = build_payload(client=self._client, plan=self._plan, fmt_date_ui=self._fmt_date_ui)
+                build_diet_plan_pdf(target, self._payload)
             QMessageBox.information(self, "Başarılı", "PDF kaydedildi.")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"PDF kaydedilemedi:\n{e}")
@@ -1,5 +1,4 @@
 import sys
-import time
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 from src.app.bootstrap import bootstrap
@@ -7,7 +6,9 @@ from src.ui.main_window import MainWindow
 
 from src.ui.splash import PremiumSplash
 
-from PySide6.QtCore import qInstallMessageHandler, QtMsgType
+from PySide6.QtCore import (
+    qInstallMessageHandler, QtMsgType, QCoreApplication, QObject, QThread, QTimer, Slot,
+)
 
 def _qt_msg_handler(mode, context, message):
     # Konsolu gereksiz dolduran font uyarısını bastıralım.
@@ -21,9 +22,13 @@ def _qt_msg_handler(mode, context, message):
         pass
 
 
+QSS_PATH = "src/ui/theme/style.qss"
+
 def load_qss(app: QApplication) -> None:
+    # style.qss tasarım güncellemeleriyle (apply_design_updates.bat) değiştirildiği
+    # için Python string'i olarak gömülmez; süreç başına bir kez okunur.
     try:
-        with open("src/ui/theme/style.qss", "r", encoding="utf-8") as fp:
+        with open(QSS_PATH, "r", encoding="utf-8") as fp:
             app.setStyleSheet(fp.read())
     except Exception as exc:
         sys.stderr.write(f"Failed to load QSS: {exc}\n")
@@ -39,6 +44,72 @@ def apply_default_font(app: QApplication) -> None:
     except Exception as exc:
         sys.stderr.write(f"Failed to apply default font: {exc}\n")
 
+class _BootstrapThread(QThread):
+    """Runs bootstrap() off the GUI thread; result is read after `finished`."""
+
+    def __init__(self):
+        super().__init__()
+        self.state = None
+        self.log = None
+        self.error = None
+
+    def run(self) -> None:
+        try:
+            self.state, self.log = bootstrap()
+            # Seed thread bu worker'da oluşturuldu; worker bitince sahipsiz
+            # kalmasın diye GUI thread'e taşıyalım.
+            seed_thread = self.state.seed_thread
+            if seed_thread is not None:
+                seed_thread.moveToThread(QCoreApplication.instance().thread())
+        except Exception as exc:
+            self.error = exc
+
+class _StartupController(QObject):
+    """Shows the main window once bootstrap is done and the splash minimum time passed."""
+
+    def __init__(self, splash):
+        super().__init__()
+        self.splash = splash
+        self.worker = None
+        self.win = None
+        self._min_elapsed = splash is None
+
+    @Slot()
+    def on_bootstrap_finished(self) -> None:
+        worker = self.worker
+        if worker.error is not None:
+            sys.stderr.write(f"Bootstrap failed: {worker.error}\n")
+            QCoreApplication.exit(1)
+            return
+
+        self.win = MainWindow(state=worker.state, log=worker.log)
+        if self.splash is None:
+            self.win.showMaximized()
+            return
+        # Ana pencereyi splash kapanana kadar göstermeyelim (arkadan açılıp üstte splash kalmasın).
+        self.win.setWindowOpacity(0.0)
+        self.win.showMaximized()
+        # Splash fade-out bitince ana pencereyi görünür yap.
+        self.splash.finished.connect(self._show_main_after_splash)
+        self._maybe_close_splash()
+
+    @Slot()
+    def on_min_splash_elapsed(self) -> None:
+        self._min_elapsed = True
+        self._maybe_close_splash()
+
+    def _maybe_close_splash(self) -> None:
+        if self._min_elapsed and self.win is not None and self.splash is not None:
+            self.splash.close_with_fade()
+
+    def _show_main_after_splash(self) -> None:
+        try:
+            self.win.setWindowOpacity(1.0)
+            self.win.raise_()
+            self.win.activateWindow()
+        except Exception as exc:
+            sys.stderr.write(f"Failed to show main window: {exc}\n")
+
 def main():
     app = QApplication(sys.argv)
     qInstallMessageHandler(_qt_msg_handler)
@@ -51,40 +122,38 @@ def main():
         splash = PremiumSplash(logo_path="src/assets/nutrinexus_logo.png")
         splash.show()
         splash.play()
-        app.processEvents()
     except Exception as exc:
         sys.stderr.write(f"Splash failed to start: {exc}\n")
 
-    t0 = time.monotonic()
-    state, log = bootstrap()
-
-    win = MainWindow(state=state, log=log)
-    # Ana pencereyi splash kapanana kadar göstermeyelim (arkadan açılıp üstte splash kalmasın).
-    win.setWindowOpacity(0.0)
-    win.showMaximized()
+    # bootstrap() (DB açılışı + migration) worker thread'de çalışır; splash bu sırada
+    # event loop tarafından akıcı şekilde boyanır. MainWindow GUI thread'de kurulur.
+    controller = _StartupController(splash)
+    worker = _BootstrapThread()
+    worker.finished.connect(controller.on_bootstrap_finished)
+    controller.worker = worker
+    worker.start()
 
     if splash is not None:
-        # Splash en az belirli bir süre ekranda kalsın.
-        elapsed_ms = int((time.monotonic() - t0) * 1000)
-        remaining = max(0, splash.minimum_visible_ms - elapsed_ms)
-        # Fade-out animasyonu event loop içinde düzgün çalışsın diye timer ile kapatıyoruz.
-        from PySide6.QtCore import QTimer
-        def _show_main_after_splash():
-            try:
-                win.setWindowOpacity(1.0)
-                win.raise_()
-                win.activateWindow()
-            except Exception as exc:
-                sys.stderr.write(f"Failed to show main window: {exc}\n")
-
-        # Splash fade-out bitince ana pencereyi görünür yap.
-        splash.finished.connect(_show_main_after_splash)
-
-        QTimer.singleShot(int(remaining), splash.close_with_fade)
-    else:
-        win.setWindowOpacity(1.0)
+        # Splash en az belirli bir süre ekranda kalsın (gösterildiği andan itibaren).
+        QTimer.singleShot(splash.minimum_visible_ms, controller.on_min_splash_elapsed)
 
     rc = app.exec()
+    worker.wait()
+    state = worker.state
+    if state is None:
+        sys.exit(rc)
+    # Arka plan katalog seed'i bitmeden bağlantıyı kapatmayalım ve süreçten çıkmayalım.
+    # Zaman aşımı yok: çalışan bir QThread'i yok etmek süreci çökertir, seed ise
+    # tek transaction'da yazdığı için yarıda kesilmemelidir (ilk kurulumda birkaç saniye).
+    if state.seed_thread is not None:
+        try:
+            state.seed_thread.wait()
+        except Exception:
+            pass
+    try:
+        state.conn.execute("PRAGMA optimize;")
+    except Exception:
+        pass
     try:
         state.conn.close()
     except Exception:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
-from uuid import uuid4
+import heapq
 import re
+import secrets
+from xml.sax.saxutils import escape
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
@@ -22,6 +25,29 @@ from src.services.clients_service import ClientsService
 # Reuse Arial registration helper from main PDF report module
 from src.reports.pdf_report import _try_register_arial
 
+_C_BORDER = colors.HexColor("#D7DEE6")
+_C_BG = colors.HexColor("#F7F9FC")
+_C_LABEL = colors.HexColor("#425466")
+
+# Measurement card table style (font is set per build, see below).
+_MEAS_TABLE_STYLE = TableStyle([
+    ("FONTSIZE", (0,0), (-1,-1), 10),
+    ("TEXTCOLOR", (0,0), (0,-1), _C_LABEL),
+    ("BACKGROUND", (0,0), (-1,-1), _C_BG),
+    ("BOX", (0,0), (-1,-1), 0.6, _C_BORDER),
+    ("INNERGRID", (0,0), (-1,-1), 0.3, _C_BORDER),
+    ("LEFTPADDING", (0,0), (-1,-1), 8),
+    ("RIGHTPADDING", (0,0), (-1,-1), 8),
+    ("TOPPADDING", (0,0), (-1,-1), 6),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+])
+
+_SEV_SCORE = {"critical": 3, "warn": 2, "info": 1}
+_SEV_COLOR = {"critical": "#E74C3C", "warn": "#F39C12", "info": "#3498DB"}
+
+_WS_RE = re.compile(r"\s+")
+_BAD_TABLE = str.maketrans({c: "-" for c in '\\/:*?"<>|'})
+
 
 def _safe_filename(text) -> str:
     """Windows-safe filename.
@@ -40,8 +66,8 @@ def _safe_filename(text) -> str:
         text = str(text)
 
     t = (text or "").strip()
-    t = re.sub(r"\s+", " ", t).strip()
-    t = re.sub(r"[\\/:*?\"<>|]+", "-", t)
+    t = _WS_RE.sub(" ", t).strip()
+    t = t.translate(_BAD_TABLE)
     t = t.replace(" ", "_")
     return t or "Danisan"
 
@@ -49,6 +75,8 @@ def _safe_filename(text) -> str:
 
 def _as_text(v) -> str:
     """Coerce possibly-dict values to a clean string."""
+    if isinstance(v, str):
+        return v.strip()
     if v is None:
         return ""
     if isinstance(v, dict):
@@ -58,9 +86,25 @@ def _as_text(v) -> str:
             if isinstance(vv, str) and vv.strip():
                 return vv.strip()
         return str(v)
-    if not isinstance(v, str):
-        return str(v)
-    return v.strip()
+    return str(v)
+
+@lru_cache(maxsize=4)
+def _get_styles(font_name: str) -> Tuple[ParagraphStyle, ParagraphStyle, ParagraphStyle, ParagraphStyle]:
+    """(base, h1, h2, muted) paragraph styles; built once per font."""
+    styles = getSampleStyleSheet()
+    base = ParagraphStyle(
+        "base", parent=styles["Normal"], fontName=font_name, fontSize=10, leading=13, textColor=colors.HexColor("#1f2d3d")
+    )
+    h1 = ParagraphStyle(
+        "h1", parent=base, fontSize=16, leading=18, spaceAfter=6, textColor=colors.HexColor("#0B1F2A")
+    )
+    h2 = ParagraphStyle(
+        "h2", parent=base, fontSize=12, leading=14, spaceBefore=8, spaceAfter=6, textColor=colors.HexColor("#0B1F2A")
+    )
+    muted = ParagraphStyle(
+        "muted", parent=base, fontSize=9, leading=12, textColor=colors.HexColor("#6B7785")
+    )
+    return base, h1, h2, muted
 
 def _bmi(height_cm: Optional[float], weight_kg: Optional[float]) -> Optional[float]:
     if not height_cm or not weight_kg:
@@ -85,43 +129,27 @@ def build_clinical_summary_pdf(*, conn, client_id: str, out_dir: str | Path | No
     if isinstance(full_name, dict):
         full_name = full_name.get('full_name') or full_name.get('name') or 'Danışan'
 
-    today_iso = datetime.now().date().isoformat()
-    unique = uuid4().hex[:6].upper()
+    today = datetime.now().date()
+    today_iso = today.isoformat()
+    unique = secrets.token_hex(3).upper()
     fname = f"{_safe_filename(full_name)}_{today_iso}_KlinikOzet_{unique}.pdf"
     out_path = out_base / fname
 
     # data
     engine = ClinicalIntelligence(conn)
-    meas_alerts: List[Insight] = engine.measurement_alerts(client_id) or []
+    meas_alerts, latest = engine.measurement_alerts_and_latest(client_id)
     lab_taken_at, lab_rows = engine.latest_labs(client_id)
     lab_ins = engine.lab_insights(lab_rows) if lab_rows else []
 
-    # latest measurement
-    row = conn.execute(
-        """SELECT measured_at, height_cm, weight_kg, waist_cm
-           FROM measurements WHERE client_id=? ORDER BY measured_at DESC LIMIT 1""",
-        (client_id,),
-    ).fetchone()
-    m_date = row[0] if row else ""
-    height_cm = float(row[1]) if row and row[1] is not None else None
-    weight_kg = float(row[2]) if row and row[2] is not None else None
-    waist_cm = float(row[3]) if row and row[3] is not None else None
+    # latest measurement (REAL columns: no float() casts needed)
+    m_date = latest.measured_at if latest else ""
+    height_cm = latest.height_cm if latest else None
+    weight_kg = latest.weight_kg if latest else None
+    waist_cm = latest.waist_cm if latest else None
     bmi = _bmi(height_cm, weight_kg)
 
     font_name = _try_register_arial()
-    styles = getSampleStyleSheet()
-    base = ParagraphStyle(
-        "base", parent=styles["Normal"], fontName=font_name, fontSize=10, leading=13, textColor=colors.HexColor("#1f2d3d")
-    )
-    h1 = ParagraphStyle(
-        "h1", parent=base, fontSize=16, leading=18, spaceAfter=6, textColor=colors.HexColor("#0B1F2A")
-    )
-    h2 = ParagraphStyle(
-        "h2", parent=base, fontSize=12, leading=14, spaceBefore=8, spaceAfter=6, textColor=colors.HexColor("#0B1F2A")
-    )
-    muted = ParagraphStyle(
-        "muted", parent=base, fontSize=9, leading=12, textColor=colors.HexColor("#6B7785")
-    )
+    base, h1, h2, muted = _get_styles(font_name)
 
     doc = SimpleDocTemplate(
         str(out_path),
@@ -136,9 +164,9 @@ def build_clinical_summary_pdf(*, conn, client_id: str, out_dir: str | Path | No
 
     story = []
     story.append(Paragraph("Klinik Özet", h1))
-    story.append(Paragraph(f"<b>Danışan:</b> {full_name}  &nbsp;&nbsp; <b>Tarih:</b> {format_tr_date(today_iso)}", base))
+    story.append(Paragraph(f"<b>Danışan:</b> {full_name}  &nbsp;&nbsp; <b>Tarih:</b> {format_tr_date(today)}", base))
     story.append(Spacer(1, 6))
-    story.append(HRFlowable(width="100%", thickness=0.8, color=colors.HexColor("#D7DEE6")))
+    story.append(HRFlowable(width="100%", thickness=0.8, color=_C_BORDER))
     story.append(Spacer(1, 8))
 
     # Measurement card table
@@ -150,48 +178,35 @@ def build_clinical_summary_pdf(*, conn, client_id: str, out_dir: str | Path | No
         ["Bel", f"{waist_cm:.0f} cm" if waist_cm else "-"],
     ]
     t = Table(meas_tbl, colWidths=[35*mm, 145*mm])
-    t.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), font_name),
-        ("FONTSIZE", (0,0), (-1,-1), 10),
-        ("TEXTCOLOR", (0,0), (0,-1), colors.HexColor("#425466")),
-        ("BACKGROUND", (0,0), (-1,-1), colors.HexColor("#F7F9FC")),
-        ("BOX", (0,0), (-1,-1), 0.6, colors.HexColor("#D7DEE6")),
-        ("INNERGRID", (0,0), (-1,-1), 0.3, colors.HexColor("#D7DEE6")),
-        ("LEFTPADDING", (0,0), (-1,-1), 8),
-        ("RIGHTPADDING", (0,0), (-1,-1), 8),
-        ("TOPPADDING", (0,0), (-1,-1), 6),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-    ]))
+    t.setStyle(_MEAS_TABLE_STYLE)
+    # Font depends on whether Arial could be registered; applied separately.
+    t.setStyle([("FONTNAME", (0,0), (-1,-1), font_name)])
     story.append(t)
 
     # Clinical summary
     story.append(Paragraph("Klinik Zeka • Tek Bakış", h2))
 
-    def _sev_color(sev: str) -> str:
-        return {"critical":"#E74C3C", "warn":"#F39C12", "info":"#3498DB"}.get(sev or "info", "#3498DB")
-
     combined: List[Insight] = []
     combined.extend(meas_alerts)
     combined.extend(lab_ins)
 
-    # sort by severity score then keep first 6 to fit one page
-    sev_score = {"critical":3, "warn":2, "info":1}
-    combined.sort(key=lambda x: (sev_score.get(x.severity or "info",1), x.title or ""), reverse=True)
-    top = combined[:6]
+    # keep the 6 highest by severity score (then title) to fit one page
+    top = heapq.nlargest(6, combined, key=lambda x: (_SEV_SCORE.get(x.severity or "info", 1), x.title or ""))
 
     if not top:
         story.append(Paragraph("Henüz klinik öneri yok.", muted))
     else:
         # build bullets as Paragraphs
         for it in top:
-            title = _as_text(getattr(it, 'title', None))
-            detail = _as_text(getattr(it, 'detail', None))
-            sev = _as_text(getattr(it, 'severity', None)) or "info"
-            dot = f"<font color='{_sev_color(sev)}'>●</font>"
-            body = f"{dot} <b>{title}</b>"
+            title = _as_text(it.title)
+            detail = _as_text(it.detail)
+            sev = _as_text(it.severity) or "info"
+            dot = f"<font color='{_SEV_COLOR.get(sev, '#3498DB')}'>●</font>"
+            # title/detail may contain &, <, > (rule text, user data): escape once
+            parts = [dot, " <b>", escape(title), "</b>"]
             if detail:
-                body += f"<br/><font color='#566573'>{detail}</font>"
-            story.append(Paragraph(body, base))
+                parts += ["<br/><font color='#566573'>", escape(detail), "</font>"]
+            story.append(Paragraph("".join(parts), base))
             story.append(Spacer(1, 4))
 
     # Lab taken at info
@@ -200,7 +215,7 @@ def build_clinical_summary_pdf(*, conn, client_id: str, out_dir: str | Path | No
         story.append(Paragraph(f"<font color='#6B7785'>Not: Son kan tahlili tarihi: {format_tr_date(lab_taken_at)}</font>", muted))
 
     story.append(Spacer(1, 8))
-    story.append(HRFlowable(width="100%", thickness=0.8, color=colors.HexColor("#D7DEE6")))
+    story.append(HRFlowable(width="100%", thickness=0.8, color=_C_BORDER))
     story.append(Spacer(1, 6))
     story.append(Paragraph("Bu çıktı kural tabanlı öneriler içerir; klinik karar yerine geçmez.", muted))
 
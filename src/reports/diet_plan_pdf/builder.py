@@ -4,28 +4,53 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple, Optional
 
 from reportlab.platypus import (
-    KeepTogether,
     SimpleDocTemplate,
     Paragraph,
     Table,
     TableStyle,
     Spacer,
-    Image,
 )
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import datetime as _dt
 import os, re
+import threading
 from xml.sax.saxutils import escape as _xml_escape
 
 _FONT = 'Helvetica'
 _BOLD_FONT = 'Helvetica-Bold'
 
+# src/ (bundled fonts and logos live under src/assets)
+_ASSETS_BASE = Path(__file__).resolve().parents[2]
+
+# Patterns used on every build (per line / per item): compile once.
+_BULLET_RE = re.compile(r"^\d+[\).]\s+")
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+_MARKER_RE = re.compile(r"^\[(.+?)\]$")
+# Same test as _MARKER_RE, run once over all food names joined with NUL.
+_MARKER_FAST = re.compile(r"(?:^|\x00)\[[^\x00\n]+\](?=\x00|$)")
+_NEEDS_ESC = re.compile(r"[&<>\n]")
+_BULLET_PREFIX_RE = re.compile(r"^[•\-*]+\s*")
+# food/amount separators in priority order (" - " wins over ": " even if later
+# in the line); each alternative captures (food, amount), so the pair is
+# m.group(m.lastindex - 1), m.group(m.lastindex).
+_SEP_RE = re.compile(r"^(.*?) - (.*)$|^(.*?) – (.*)$|^(.*?) : (.*)$|^(.*?): (.*)$", re.S)
+
+# pdfmetrics' font registry is process-global: register under a lock, once.
+_FONT_LOCK = threading.Lock()
+_FONT_REGISTERED = False
+
+
 def _register_fonts() -> str:
     """Best-effort font registration (regular + bold) for Turkish characters.
 
@@ -33,11 +58,26 @@ def _register_fonts() -> str:
     1) Bundled fonts under src/assets/fonts (so packaged app is deterministic)
     2) System fonts (Windows / Linux)
     3) ReportLab core fonts (Helvetica)
+
+    Runs once per process (thread-safe); later builds reuse the registered
+    fonts instead of re-probing the candidates and re-parsing the TTF files.
+    Registration stays lazy so importing this module (done at UI startup)
+    does not pay for TTF parsing.
     """
+    global _FONT_REGISTERED
+    if _FONT_REGISTERED:
+        return _FONT
+    with _FONT_LOCK:
+        if not _FONT_REGISTERED:
+            _register_fonts_once()
+            _FONT_REGISTERED = True
+    return _FONT
+
+
+def _register_fonts_once() -> str:
     global _FONT, _BOLD_FONT
 
-    base_dir = Path(__file__).resolve().parents[2]
-    bundled_dir = base_dir / "assets" / "fonts"
+    bundled_dir = _ASSETS_BASE / "assets" / "fonts"
 
     candidates = [
         (str(bundled_dir / "DejaVuSans.ttf"), str(bundled_dir / "DejaVuSans-Bold.ttf")),
@@ -74,21 +114,18 @@ def _fmt_tr_date(value: Any) -> str:
     Accepts 'YYYY-MM-DD' strings, datetime.date/datetime, or returns
     the original string if parsing fails.
     """
-    if value is None:
+    # Payload values are almost always DB strings: check that case first.
+    if isinstance(value, str):
+        s = value.strip()
+    elif value is None:
         return ""
-    # datetime/date
-    try:
-        import datetime as _dt
-        if isinstance(value, (_dt.date, _dt.datetime)):
-            d = value.date() if isinstance(value, _dt.datetime) else value
-            return f"{d.day:02d}.{d.month:02d}.{d.year:04d}"
-    except Exception:
-        pass
-
-    s = str(value).strip()
-    m = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", s)
+    elif isinstance(value, _dt.date):  # datetime is a date subclass
+        return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
+    else:
+        s = str(value).strip()
+    m = _DATE_RE.match(s)
     if m:
-        y, mo, da = m.group(1), m.group(2), m.group(3)
+        y, mo, da = m.groups()
         return f"{da}.{mo}.{y}"
     return s
 
@@ -105,22 +142,34 @@ def _resolve_logo_path(payload: Dict[str, Any]) -> str:
         return p
 
     # 2) bundled default
-    base_dir = Path(__file__).resolve().parents[2]
+    return _resolve_default_logo()
+
+
+@lru_cache(maxsize=1)
+def _resolve_default_logo() -> str:
+    """Bundled NutriNexus logo path ('' if missing); resolved once per process."""
     for rel in (
-        base_dir / "assets" / "nutrinexus_logo.png",
-        base_dir / "assets" / "images" / "nutrinexus_logo.png",
+        _ASSETS_BASE / "assets" / "nutrinexus_logo.png",
+        _ASSETS_BASE / "assets" / "images" / "nutrinexus_logo.png",
     ):
         if rel.exists():
             return str(rel)
     return ""
 
 
+def _iter_nonblank(text: str):
+    """Yield stripped, non-empty lines of text (single pass, no intermediate list)."""
+    for ln in text.splitlines():
+        s = ln.strip()
+        if s:
+            yield s
+
+
 def _parse_sections(plan_text: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
     text = (plan_text or "").strip()
     if not text:
         return []
 
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
     sections: List[Tuple[str, List[Tuple[str, str]]]] = []
     cur_title = "Diyet"
     cur_items: List[Tuple[str, str]] = []
@@ -131,23 +180,22 @@ def _parse_sections(plan_text: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
             sections.append((cur_title, cur_items))
             cur_items = []
 
-    for ln in lines:
+    for ln in _iter_nonblank(text):
         if ln.endswith(":") and len(ln) < 40:
             flush()
             cur_title = ln[:-1].strip() or "Diyet"
             continue
         # bullets
-        ln2 = re.sub(r"^\d+[\).]\s+", "", ln)
-        ln2 = ln2.lstrip("•-*").strip()
+        ln2 = _BULLET_PREFIX_RE.sub("", _BULLET_RE.sub("", ln))
         if not ln2:
             continue
         # split amount
-        food, amt = ln2, ""
-        for sep in (" - ", " – ", " : ", ": "):
-            if sep in ln2:
-                a,b = ln2.split(sep,1)
-                food, amt = a.strip(), b.strip()
-                break
+        m = _SEP_RE.search(ln2)
+        if m:
+            i = m.lastindex
+            food, amt = m.group(i - 1).strip(), m.group(i).strip()
+        else:
+            food, amt = ln2, ""
         cur_items.append((food, amt))
     flush()
     return sections
@@ -174,8 +222,7 @@ def _normalize_sections_for_cards(sections: List[Tuple[str, List[Tuple[str, str]
         return sections
 
     # Detect bracket markers like [Kahvaltı]
-    marker_re = re.compile(r"^\[(.+?)\]$")
-    has_marker = any(marker_re.match((food or "").strip()) for food, _ in items0)
+    has_marker = _MARKER_FAST.search("\x00".join((food or "").strip() for food, _ in items0))
     if not has_marker:
         return sections
 
@@ -192,7 +239,7 @@ def _normalize_sections_for_cards(sections: List[Tuple[str, List[Tuple[str, str]
 
     for food, amt in items0:
         f = (food or "").strip()
-        m = marker_re.match(f)
+        m = _MARKER_RE.match(f)
         if m:
             # new meal section
             if cur_title is not None:
@@ -224,25 +271,180 @@ def _safe_para(text: str) -> str:
     # Escape XML markup chars and keep explicit line breaks.
     return _xml_escape(s).replace("\n", "<br/>")
 
-def _meal_card(*, font: str, sec_title: str, items: List[Tuple[str, str]], available_width: float) -> Table:
-    """Create a 'card' block for a meal section matching the in-app preview look."""
-    green = colors.HexColor("#2f7d32")  # preview accent
-    border = colors.HexColor("#d7dde3")
-    grid = colors.HexColor("#eef2f5")
-    header_bg = colors.HexColor("#F1F4F7")
-    th_bg = colors.HexColor("#fafbfc")
-    body_text = colors.HexColor("#102A33")
-    muted = colors.HexColor("#6b7280")
 
-    stripe_w = 4 * mm
-    inner_w = max(1, available_width - stripe_w)
+def _lines_para(text: str) -> str:
+    """Non-blank lines of free text as one escaped Paragraph body (<br/> between
+    lines): a single flowable instead of one Paragraph per line."""
+    return "<br/>".join(_xml_escape(ln) for ln in _iter_nonblank(text))
+
+
+def _cell(text: str, style: ParagraphStyle, max_w: float):
+    """Table cell for a food/amount value.
+
+    Short single-line values without markup characters that fit the column are
+    returned as plain strings (no Paragraph parse/line-break pass); the table
+    style applies the same font/size/color to them. Everything else still goes
+    through _safe_para + Paragraph so it wraps and is escaped.
+    """
+    s = (text or "").strip()
+    if not s:
+        return "-"
+    if (len(s) < 60 and not _NEEDS_ESC.search(s)
+            and pdfmetrics.stringWidth(s, style.fontName, style.fontSize) <= max_w):
+        return s
+    return Paragraph(_safe_para(s), style)
+
+
+# Palette (preview look) and fixed dimensions, shared by all builds.
+_CLR_GREEN = colors.HexColor("#2f7d32")  # preview accent
+_CLR_BORDER = colors.HexColor("#d7dde3")
+_CLR_GRID = colors.HexColor("#eef2f5")
+_CLR_HEADER_BG = colors.HexColor("#F1F4F7")
+_CLR_TH_BG = colors.HexColor("#fafbfc")
+_CLR_TH = colors.HexColor("#445")
+_CLR_BODY = colors.HexColor("#102A33")
+_CLR_AMT = colors.HexColor("#111")
+_CLR_MUTED = colors.HexColor("#6b7280")
+_CLR_BOX_BORDER = colors.HexColor("#D9E2EA")
+_CLR_BOX_GRID = colors.HexColor("#E3EAF1")
+_CLR_BOX_HEADER_BG = colors.HexColor("#F4F6F8")
+_CLR_BOX_LABEL = colors.HexColor("#334155")
+_CLR_BOX_TEXT = colors.HexColor("#0f172a")
+_CLR_FRAME = colors.HexColor("#CBD5E1")
+
+_STRIPE_W = 4 * mm  # meal card accent stripe
+_AMT_W = 28 * mm  # fixed "Miktar" column
+_INFO_GAP = 6 * mm  # between the two info boxes
+_INFO_LABEL_W_LEFT = 28 * mm
+_INFO_LABEL_W_RIGHT = 24 * mm
+_HEADER_SIDE_W = 28 * mm  # logo / balance columns of the title row
+_FRAME_R = 3.5 * mm
+_FRAME_PAD = 6 * mm
+_FOOTER_DY = 5 * mm
+_LOGO_MAX_W = 32 * mm
+_LOGO_MAX_H = 14 * mm
+_PAGE_MARGIN = 15 * mm
+
+
+# Static part of the inner meal-card table style (FONTNAME is prepended per font).
+_MEAL_INNER_TS = (
+    # Force wrapping in table cells so long food names never get visually cut.
+    ("WORDWRAP", (0,0), (-1,-1), "CJK"),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ("RIGHTPADDING", (1, 0), (1, -1), 14),
+    ("LEFTPADDING", (1, 0), (1, -1), 6),
+    ("LEFTPADDING", (0,0), (-1,-1), 7),
+    ("RIGHTPADDING", (0,0), (-1,-1), 7),
+    ("TOPPADDING", (0,0), (-1,-1), 4),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+
+    # Title band row (0)
+    ("SPAN", (0,0), (-1,0)),
+    ("ALIGN", (0,0), (-1,0), "CENTER"),
+    ("BACKGROUND", (0,0), (-1,0), _CLR_HEADER_BG),
+    ("LINEBELOW", (0,0), (-1,0), 0.75, _CLR_BORDER),
+
+    # Table header row (1)
+    ("BACKGROUND", (0,1), (-1,1), _CLR_TH_BG),
+    ("LINEBELOW", (0,1), (-1,1), 0.5, _CLR_GRID),
+    ("BOTTOMPADDING", (0,1), (-1,1), 6),
+    ("TOPPADDING", (0,1), (-1,1), 6),
+)
+
+# Data rows (row 2..). Plain-string cells (see _cell) render like the
+# td_food/td_amt Paragraphs; FONTNAME (bold font) is added per call.
+# Paragraph cells span the column so they sit left; strings do the same.
+_MEAL_INNER_ITEMS_TS = (
+    ("LINEBELOW", (0,2), (-1,-1), 0.5, _CLR_GRID),
+    ("FONTSIZE", (0,2), (-1,-1), 9.6),
+    ("LEADING", (0,2), (-1,-1), 12.5),
+    ("TEXTCOLOR", (0,2), (0,-1), _CLR_BODY),
+    ("TEXTCOLOR", (1,2), (1,-1), _CLR_AMT),
+    ("ALIGN", (1,2), (1,-1), "LEFT"),
+)
+
+# Empty message row at row 2
+_MEAL_INNER_EMPTY_TS = (
+    ("SPAN", (0,2), (-1,2)),
+    ("BACKGROUND", (0,2), (-1,2), colors.white),
+)
+
+_MEAL_OUTER_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (0,0), _CLR_GREEN),
+    ("BOX", (0,0), (-1,-1), 0.9, _CLR_BORDER),
+    ("INNERGRID", (0,0), (-1,-1), 0, _CLR_BORDER),
+    ("LEFTPADDING", (0,0), (0,0), 0),
+    ("RIGHTPADDING", (0,0), (0,0), 0),
+    ("TOPPADDING", (0,0), (0,0), 0),
+    ("BOTTOMPADDING", (0,0), (0,0), 0),
+    ("LEFTPADDING", (1,0), (1,0), 0),
+    ("RIGHTPADDING", (1,0), (1,0), 0),
+    ("TOPPADDING", (1,0), (1,0), 0),
+    ("BOTTOMPADDING", (1,0), (1,0), 0),
+])
+
+# Danışan Bilgileri / Plan Özeti boxes (same look for both).
+_INFO_BOX_STYLE = TableStyle([
+    ("SPAN", (0,0), (-1,0)),
+    ("BACKGROUND", (0,0), (-1,0), _CLR_BOX_HEADER_BG),
+    ("BOX", (0,0), (-1,-1), 0.9, _CLR_BOX_BORDER),
+    ("INNERGRID", (0,1), (-1,-1), 0.4, _CLR_BOX_GRID),
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("LEFTPADDING", (0,0), (-1,-1), 6),
+    ("RIGHTPADDING", (0,0), (-1,-1), 6),
+    ("TOPPADDING", (0,0), (-1,-1), 4),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+])
+
+_INFO_OUTER_STYLE = TableStyle([
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ("RIGHTPADDING", (1, 0), (1, -1), 14),
+    ("LEFTPADDING", (1, 0), (1, -1), 6),
+    ("LEFTPADDING", (0,0), (-1,-1), 0),
+    ("RIGHTPADDING", (0,0), (-1,-1), 0),
+    ("TOPPADDING", (0,0), (-1,-1), 0),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 0),
+])
+
+_HEADER_DIVIDER_STYLE = TableStyle([
+    ("LINEBELOW", (0,0), (-1,-1), 0.8, _CLR_BOX_BORDER),
+    ("TOPPADDING", (0,0), (-1,-1), 2),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+    ("LEFTPADDING", (0,0), (-1,-1), 0),
+    ("RIGHTPADDING", (0,0), (-1,-1), 0),
+])
+
+_HEADER_TBL_STYLE = TableStyle([
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("ALIGN", (0,0), (0,0), "LEFT"),
+    ("ALIGN", (1,0), (1,0), "CENTER"),
+    ("LEFTPADDING", (0,0), (-1,-1), 0),
+    ("RIGHTPADDING", (0,0), (-1,-1), 0),
+    ("TOPPADDING", (0,0), (-1,-1), 0),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 0),
+])
+
+_DATE_TBL_STYLE = TableStyle([
+    ('LEFTPADDING', (0,0), (-1,-1), 0),
+    ('RIGHTPADDING', (0,0), (-1,-1), 0),
+    ('RIGHTPADDING', (1,0), (1,0), 6),  # shift date slightly left
+    ('TOPPADDING', (0,0), (-1,-1), 0),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 0),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+])
+
 
+@lru_cache(maxsize=4)
+def _meal_card_styles(font: str, bold_font: str) -> Dict[str, ParagraphStyle]:
+    """Paragraph styles of a meal card; built once per font pair, shared by every card."""
     styles = getSampleStyleSheet()
     # Öğün başlığı: preview'daki gibi ortalı + kalın
     h = ParagraphStyle(
         "nx_meal_h",
         parent=styles["Normal"],
-        fontName=_BOLD_FONT,
+        fontName=bold_font,
         fontSize=11.5,
         leading=14,
         textColor=colors.black,
@@ -252,28 +454,28 @@ def _meal_card(*, font: str, sec_title: str, items: List[Tuple[str, str]], avail
     th = ParagraphStyle(
         "nx_th",
         parent=styles["Normal"],
-        fontName=_BOLD_FONT,
+        fontName=bold_font,
         fontSize=9.4,
         leading=12,
-        textColor=colors.HexColor("#445"),
+        textColor=_CLR_TH,
     )
     td_food = ParagraphStyle(
         "nx_food",
         parent=styles["Normal"],
-        fontName=_BOLD_FONT,
+        fontName=bold_font,
         fontSize=9.6,
         leading=12.5,
-        textColor=body_text,
+        textColor=_CLR_BODY,
         wordWrap="CJK",
         splitLongWords=True,  # robust wrapping
     )
     td_amt = ParagraphStyle(
         "nx_amt",
         parent=styles["Normal"],
-        fontName=_BOLD_FONT,
+        fontName=bold_font,
         fontSize=9.6,
         leading=12.5,
-        textColor=colors.HexColor("#111"),
+        textColor=_CLR_AMT,
     )
     empty_style = ParagraphStyle(
         "nx_empty",
@@ -281,118 +483,115 @@ def _meal_card(*, font: str, sec_title: str, items: List[Tuple[str, str]], avail
         fontName=font,
         fontSize=9.6,
         leading=12.5,
-        textColor=muted,
+        textColor=_CLR_MUTED,
         wordWrap="CJK",
         splitLongWords=True,
     )
+    return {"h": h, "th": th, "td_food": td_food, "td_amt": td_amt, "empty": empty_style}
 
-    # Build inner table: title band + table header + rows (or empty message)
-    inner_rows = []
 
-    # Title band
-    inner_rows.append([Paragraph(f"<b>{sec_title}</b>", h), ""])
-    # Table header
-    inner_rows.append([Paragraph("<b>Besin</b>", th), Paragraph("<b>Miktar</b>", th)])
+class _MealCardFactory:
+    """Meal card template for one font pair.
 
-    if items:
-        for food, amt in items:
-            food_p = Paragraph(_safe_para(food), td_food)
-            amt_p = Paragraph(_safe_para(amt), td_amt)
-            inner_rows.append([food_p, amt_p])
-    else:
-        # Empty meal message spanning both cols, no table rows
-        inner_rows.append([Paragraph("Bu öğün için içerik eklenmemiştir.", empty_style), ""])
+    Paragraph styles and both variants of the inner TableStyle (with items /
+    empty message) are built once; make() only creates the rows and the two
+    Tables of a card.
+    """
 
+    __slots__ = ("h", "th", "td_food", "td_amt", "empty", "items_ts", "empty_ts")
+
+    def __init__(self, font: str, bold_font: str):
+        st = _meal_card_styles(font, bold_font)
+        self.h, self.th, self.td_food, self.td_amt, self.empty = (
+            st["h"], st["th"], st["td_food"], st["td_amt"], st["empty"]
+        )
+        base = [("FONTNAME", (0,0), (-1,-1), font), *_MEAL_INNER_TS]
+        self.items_ts = TableStyle([*base, ("FONTNAME", (0,2), (-1,-1), self.td_food.fontName), *_MEAL_INNER_ITEMS_TS])
+        self.empty_ts = TableStyle([*base, *_MEAL_INNER_EMPTY_TS])
+
+    def make(self, sec_title: str, items: List[Tuple[str, str]],
+             widths: Tuple[float, float, float, float]) -> Table:
+        stripe_w, inner_w, amt_w, food_w = widths
+
+        # Build inner table: title band + table header + rows (or empty message)
+        inner_rows = [
+            [Paragraph(f"<b>{sec_title}</b>", self.h), ""],
+            [Paragraph("<b>Besin</b>", self.th), Paragraph("<b>Miktar</b>", self.th)],
+        ]
+        if items:
+            # Text width available inside a cell (7pt left/right padding).
+            td_food, td_amt = self.td_food, self.td_amt
+            food_txt_w = food_w - 14
+            amt_txt_w = amt_w - 14
+            inner_rows += [[_cell(food, td_food, food_txt_w), _cell(amt, td_amt, amt_txt_w)] for food, amt in items]
+        else:
+            # Empty meal message spanning both cols, no table rows
+            inner_rows.append([Paragraph("Bu öğün için içerik eklenmemiştir.", self.empty), ""])
+
+        inner = Table(inner_rows, colWidths=[food_w, amt_w])
+        inner.setStyle(self.items_ts if items else self.empty_ts)
+
+        outer = Table([[ "", inner ]], colWidths=[stripe_w, inner_w])
+        outer.setStyle(_MEAL_OUTER_STYLE)
+        return outer
+
+
+def _meal_card_widths(available_width: float) -> Tuple[float, float, float, float]:
+    """(stripe_w, inner_w, amt_w, food_w) of a meal card; same for every card of a document."""
+    inner_w = max(1, available_width - _STRIPE_W)
     # Column widths: fixed amount column like preview (110px-ish)
     # Keep "Miktar" compact so long food names don't look clipped.
-    amt_w = 28 * mm
-    food_w = max(1, inner_w - amt_w)
-
-    inner = Table(inner_rows, colWidths=[food_w, amt_w])
-
-    # Style inner
-    ts = [
-        ("FONTNAME", (0,0), (-1,-1), font),
-        # Force wrapping in table cells so long food names never get visually cut.
-        ("WORDWRAP", (0,0), (-1,-1), "CJK"),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-        ("RIGHTPADDING", (1, 0), (1, -1), 14),
-        ("LEFTPADDING", (1, 0), (1, -1), 6),
-        ("LEFTPADDING", (0,0), (-1,-1), 7),
-        ("RIGHTPADDING", (0,0), (-1,-1), 7),
-        ("TOPPADDING", (0,0), (-1,-1), 4),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-
-        # Title band row (0)
-        ("SPAN", (0,0), (-1,0)),
-        ("ALIGN", (0,0), (-1,0), "CENTER"),
-        ("BACKGROUND", (0,0), (-1,0), header_bg),
-        ("LINEBELOW", (0,0), (-1,0), 0.75, border),
-
-        # Table header row (1)
-        ("BACKGROUND", (0,1), (-1,1), th_bg),
-        ("LINEBELOW", (0,1), (-1,1), 0.5, grid),
-        ("BOTTOMPADDING", (0,1), (-1,1), 6),
-        ("TOPPADDING", (0,1), (-1,1), 6),
-    ]
-
-    if items:
-        # Data rows start at row 2
-        ts += [
-            ("LINEBELOW", (0,2), (-1,-1), 0.5, grid),
-            ("ALIGN", (1,2), (1,-1), "RIGHT"),
-        ]
-    else:
-        # Empty message row at row 2
-        ts += [
-            ("SPAN", (0,2), (-1,2)),
-            ("BACKGROUND", (0,2), (-1,2), colors.white),
-        ]
+    return _STRIPE_W, inner_w, _AMT_W, max(1, inner_w - _AMT_W)
 
-    inner.setStyle(TableStyle(ts))
-
-    outer = Table([[ "", inner ]], colWidths=[stripe_w, inner_w])
-    outer.setStyle(TableStyle([
-        ("BACKGROUND", (0,0), (0,0), green),
-        ("BOX", (0,0), (-1,-1), 0.9, border),
-        ("INNERGRID", (0,0), (-1,-1), 0, border),
-        ("LEFTPADDING", (0,0), (0,0), 0),
-        ("RIGHTPADDING", (0,0), (0,0), 0),
-        ("TOPPADDING", (0,0), (0,0), 0),
-        ("BOTTOMPADDING", (0,0), (0,0), 0),
-        ("LEFTPADDING", (1,0), (1,0), 0),
-        ("RIGHTPADDING", (1,0), (1,0), 0),
-        ("TOPPADDING", (1,0), (1,0), 0),
-        ("BOTTOMPADDING", (1,0), (1,0), 0),
-    ]))
-    return outer
 
+@lru_cache(maxsize=4)
+def _meal_card_factory(font: str, bold_font: str) -> _MealCardFactory:
+    return _MealCardFactory(font, bold_font)
 
 
+def _meal_card(*, font: str, sec_title: str, items: List[Tuple[str, str]], available_width: float,
+               widths: Optional[Tuple[float, float, float, float]] = None) -> Table:
+    """Create a 'card' block for a meal section matching the in-app preview look."""
+    return _meal_card_factory(font, _BOLD_FONT).make(sec_title, items, widths or _meal_card_widths(available_width))
 
-def _client_info_boxes(*, font: str, client: dict, plan: dict, date_range: str, available_width: float) -> Table:
-    """Two side-by-side boxes: Danışan Bilgileri (left) and Plan Özeti (right), preview-like."""
-    border = colors.HexColor("#D9E2EA")
-    grid = colors.HexColor("#E3EAF1")
-    header_bg = colors.HexColor("#F4F6F8")
-    label = colors.HexColor("#334155")
-    textc = colors.HexColor("#0f172a")
 
+@lru_cache(maxsize=4)
+def _client_info_boxes_styles(font: str) -> Tuple[ParagraphStyle, ParagraphStyle, ParagraphStyle]:
+    """(header, label, value) styles of the info boxes; built once per font."""
     styles = getSampleStyleSheet()
     h = ParagraphStyle("nx_box_h", parent=styles["Normal"], fontName=font, fontSize=9.6, leading=12,
-                       textColor=textc, spaceAfter=0)
+                       textColor=_CLR_BOX_TEXT, spaceAfter=0)
     l = ParagraphStyle("nx_box_l", parent=styles["Normal"], fontName=font, fontSize=8.8, leading=11,
-                       textColor=label)
+                       textColor=_CLR_BOX_LABEL)
     v = ParagraphStyle("nx_box_v", parent=styles["Normal"], fontName=font, fontSize=8.8, leading=11,
-                       textColor=textc)
+                       textColor=_CLR_BOX_TEXT)
+    return h, l, v
+
+
+@dataclass(frozen=True, slots=True)
+class _ClientInfo:
+    """Client fields shown on the PDF, resolved once from the payload dict."""
+    full_name: str
+    phone: str
+    gender: str
+    birth: str
+
+
+def _normalize_client(client: Dict[str, Any]) -> _ClientInfo:
+    get = client.get
+    return _ClientInfo(
+        full_name=str(get("full_name") or get("name") or ""),
+        phone=str(get("phone") or get("phone_number") or ""),
+        gender=str(get("gender") or get("sex") or ""),
+        birth=_fmt_tr_date(get("birth_date") or get("dob") or ""),
+    )
 
-    # values
-    full_name = client.get("full_name") or client.get("name") or ""
-    phone = client.get("phone") or client.get("phone_number") or ""
-    gender = client.get("gender") or client.get("sex") or ""
-    birth = _fmt_tr_date(client.get("birth_date") or client.get("dob") or "")
 
+def _client_info_boxes(*, font: str, client: _ClientInfo, plan: dict, date_range: str, available_width: float) -> Table:
+    """Two side-by-side boxes: Danışan Bilgileri (left) and Plan Özeti (right), preview-like."""
+    h, l, v = _client_info_boxes_styles(font)
+
+    # values
     title = (plan.get("title") or "").strip()
     period = date_range or ""
     created = plan.get("created_at_ui") or plan.get("created_at") or ""
@@ -400,23 +599,13 @@ def _client_info_boxes(*, font: str, client: dict, plan: dict, date_range: str,
     # Left box: 2-column label/value rows
     left_rows = [
         [Paragraph("<b>Danışan Bilgileri</b>", h), ""],
-        [Paragraph("Ad Soyad", l), Paragraph(str(full_name), v)],
-        [Paragraph("Telefon", l), Paragraph(str(phone), v)],
-        [Paragraph("Cinsiyet", l), Paragraph(str(gender), v)],
-        [Paragraph("Doğum Tarihi", l), Paragraph(str(birth), v)],
+        [Paragraph("Ad Soyad", l), Paragraph(client.full_name, v)],
+        [Paragraph("Telefon", l), Paragraph(client.phone, v)],
+        [Paragraph("Cinsiyet", l), Paragraph(client.gender, v)],
+        [Paragraph("Doğum Tarihi", l), Paragraph(client.birth, v)],
     ]
-    left = Table(left_rows, colWidths=[28*mm, None])
-    left.setStyle(TableStyle([
-        ("SPAN", (0,0), (-1,0)),
-        ("BACKGROUND", (0,0), (-1,0), header_bg),
-        ("BOX", (0,0), (-1,-1), 0.9, border),
-        ("INNERGRID", (0,1), (-1,-1), 0.4, grid),
-        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-        ("LEFTPADDING", (0,0), (-1,-1), 6),
-        ("RIGHTPADDING", (0,0), (-1,-1), 6),
-        ("TOPPADDING", (0,0), (-1,-1), 4),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-    ]))
+    left = Table(left_rows, colWidths=[_INFO_LABEL_W_LEFT, None])
+    left.setStyle(_INFO_BOX_STYLE)
 
     right_rows = [
         [Paragraph("<b>Plan Özeti</b>", h), ""],
@@ -426,32 +615,13 @@ def _client_info_boxes(*, font: str, client: dict, plan: dict, date_range: str,
     if created:
         right_rows.append([Paragraph("Oluşturma", l), Paragraph(str(created), v)])
 
-    right = Table(right_rows, colWidths=[24*mm, None])
-    right.setStyle(TableStyle([
-        ("SPAN", (0,0), (-1,0)),
-        ("BACKGROUND", (0,0), (-1,0), header_bg),
-        ("BOX", (0,0), (-1,-1), 0.9, border),
-        ("INNERGRID", (0,1), (-1,-1), 0.4, grid),
-        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-        ("LEFTPADDING", (0,0), (-1,-1), 6),
-        ("RIGHTPADDING", (0,0), (-1,-1), 6),
-        ("TOPPADDING", (0,0), (-1,-1), 4),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-    ]))
-
-    gap = 6*mm
+    right = Table(right_rows, colWidths=[_INFO_LABEL_W_RIGHT, None])
+    right.setStyle(_INFO_BOX_STYLE)
+
+    gap = _INFO_GAP
     col_w = (available_width - gap) / 2.0
     outer = Table([[left, right]], colWidths=[col_w, col_w])
-    outer.setStyle(TableStyle([
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-        ("RIGHTPADDING", (1, 0), (1, -1), 14),
-        ("LEFTPADDING", (1, 0), (1, -1), 6),
-        ("LEFTPADDING", (0,0), (-1,-1), 0),
-        ("RIGHTPADDING", (0,0), (-1,-1), 0),
-        ("TOPPADDING", (0,0), (-1,-1), 0),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 0),
-    ]))
+    outer.setStyle(_INFO_OUTER_STYLE)
     return outer
 
 
@@ -469,15 +639,8 @@ def _apply_empty_row_style(t: Table, row_index: int):
 
 def _header_divider(width: float) -> Table:
     """A subtle horizontal divider line."""
-    border = colors.HexColor("#D9E2EA")
     t = Table([[""]], colWidths=[width])
-    t.setStyle(TableStyle([
-        ("LINEBELOW", (0,0), (-1,-1), 0.8, border),
-        ("TOPPADDING", (0,0), (-1,-1), 2),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-        ("LEFTPADDING", (0,0), (-1,-1), 0),
-        ("RIGHTPADDING", (0,0), (-1,-1), 0),
-    ]))
+    t.setStyle(_HEADER_DIVIDER_STYLE)
     return t
 
 
@@ -489,10 +652,6 @@ def draw_page_frame(canvas, doc):
     """Draws a preview-like frame on every page + header logo + footer texts."""
     canvas.saveState()
     try:
-        from reportlab.lib import colors
-        from reportlab.lib.units import mm
-        from reportlab.platypus import Image
-
         # Content box (margins)
         x = getattr(doc, "leftMargin", 12 * mm)
         y = getattr(doc, "bottomMargin", 12 * mm)
@@ -500,9 +659,9 @@ def draw_page_frame(canvas, doc):
         h = getattr(doc, "height", doc.pagesize[1] - 2 * y)
 
         # Frame
-        canvas.setStrokeColor(colors.HexColor("#CBD5E1"))
+        canvas.setStrokeColor(_CLR_FRAME)
         canvas.setLineWidth(1.5)  # slightly thicker like preview
-        r = 3.5 * mm
+        r = _FRAME_R
         try:
             canvas.roundRect(x, y, w, h, r, stroke=1, fill=0)
         except Exception:
@@ -513,17 +672,19 @@ def draw_page_frame(canvas, doc):
         if logo_path:
             try:
                 # Keep logo in a small box; aspect preserved
-                max_h = 14 * mm
-                max_w = 32 * mm
-                img = Image(logo_path)
-                iw, ih = img.imageWidth, img.imageHeight
+                max_h = _LOGO_MAX_H
+                max_w = _LOGO_MAX_W
+                # Size probed once per build (see build_diet_plan_pdf). The image is
+                # still drawn by path: ReportLab keys the XObject by file name and
+                # reuses it on later pages (an ImageReader would be re-hashed).
+                iw, ih = getattr(doc, "_nx_logo_wh", None) or (0, 0)
                 if iw and ih:
                     scale = min(max_w / iw, max_h / ih)
                     dw, dh = iw * scale, ih * scale
                 else:
                     dw, dh = max_w, max_h
                 # position: inside frame with small padding
-                canvas.drawImage(logo_path, x + 6*mm, y + h - 6*mm - dh, width=dw, height=dh, preserveAspectRatio=True, mask='auto')
+                canvas.drawImage(logo_path, x + _FRAME_PAD, y + h - _FRAME_PAD - dh, width=dw, height=dh, preserveAspectRatio=True, mask='auto')
             except Exception:
                 pass
 
@@ -531,14 +692,16 @@ def draw_page_frame(canvas, doc):
         footer_left = getattr(doc, "_nx_footer_left", "")
         footer_right = getattr(doc, "_nx_footer_right", "NutriNexus")
         canvas.setFont(_FONT, 8)
-        canvas.setFillColor(colors.HexColor("#6B7280"))
-        fy = y + 5 * mm
+        canvas.setFillColor(_CLR_MUTED)
+        fy = y + _FOOTER_DY
         if footer_left:
-            canvas.drawString(x + 6 * mm, fy, footer_left)
+            canvas.drawString(x + _FRAME_PAD, fy, footer_left)
         if footer_right:
             # right aligned inside frame
-            tw = canvas.stringWidth(footer_right, "Helvetica", 8)
-            canvas.drawString(x + w - 6 * mm - tw, fy, footer_right)
+            tw = getattr(doc, "_nx_footer_right_w", None)
+            if tw is None:
+                tw = canvas.stringWidth(footer_right, "Helvetica", 8)
+            canvas.drawString(x + w - _FRAME_PAD - tw, fy, footer_right)
     finally:
         canvas.restoreState()
 
@@ -547,23 +710,31 @@ def build_diet_plan_pdf(path: str, payload: Dict[str, Any]) -> None:
     doc = SimpleDocTemplate(
         path,
         pagesize=A4,
-        leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm
+        leftMargin=_PAGE_MARGIN, rightMargin=_PAGE_MARGIN, topMargin=_PAGE_MARGIN, bottomMargin=_PAGE_MARGIN
     )
 
     # Runtime assets for page callback
     doc._nx_logo_path = _resolve_logo_path(payload)
+    doc._nx_logo_wh = None
+    if doc._nx_logo_path:
+        try:
+            doc._nx_logo_wh = ImageReader(doc._nx_logo_path).getSize()
+        except Exception:
+            doc._nx_logo_path = ""
     doc._nx_footer_left = "Bu plan, danışanın kişisel hedefleri ve değerlendirmesi temel alınarak hazırlanmıştır."
     doc._nx_footer_right = "NutriNexus"
+    # Same on every page: measure once for the right-aligned footer.
+    doc._nx_footer_right_w = pdfmetrics.stringWidth(doc._nx_footer_right, "Helvetica", 8)
 
     
     
     styles = getSampleStyleSheet()
     title_style = ParagraphStyle("nx_title", parent=styles["Title"], fontName=font, fontSize=16, leading=18, spaceAfter=6, alignment=TA_CENTER)
-    small_style = ParagraphStyle("nx_small", parent=styles["Normal"], fontName=font, fontSize=9, leading=12, textColor=colors.HexColor('#6B7280'))
+    small_style = ParagraphStyle("nx_small", parent=styles["Normal"], fontName=font, fontSize=9, leading=12, textColor=_CLR_MUTED)
     h_style = ParagraphStyle("nx_h", parent=styles["Heading2"], fontName=font, fontSize=11, leading=14, spaceBefore=10, spaceAfter=6)
     n_style = ParagraphStyle("nx_n", parent=styles["Normal"], fontName=font, fontSize=10, leading=14)
 
-    client = payload.get("client", {}) or {}
+    client = _normalize_client(payload.get("client", {}) or {})
     plan = payload.get("plan", {}) or {}
 
     title = (plan.get("title") or "Diyet Planı").strip()
@@ -575,30 +746,15 @@ def build_diet_plan_pdf(path: str, payload: Dict[str, Any]) -> None:
     logo = ""
     title_p = Paragraph(f"<font name='{_BOLD_FONT}'>Kişiye Özel Beslenme Planı</font>", title_style)
 
-    header_tbl = Table([[logo, title_p, ""]], colWidths=[28*mm, doc.width - 56*mm, 28*mm])
-    header_tbl.setStyle(TableStyle([
-    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-    ("ALIGN", (0,0), (0,0), "LEFT"),
-    ("ALIGN", (1,0), (1,0), "CENTER"),
-    ("LEFTPADDING", (0,0), (-1,-1), 0),
-    ("RIGHTPADDING", (0,0), (-1,-1), 0),
-    ("TOPPADDING", (0,0), (-1,-1), 0),
-    ("BOTTOMPADDING", (0,0), (-1,-1), 0),
-    ]))
+    header_tbl = Table([[logo, title_p, ""]], colWidths=[_HEADER_SIDE_W, doc.width - 2 * _HEADER_SIDE_W, _HEADER_SIDE_W])
+    header_tbl.setStyle(_HEADER_TBL_STYLE)
     el.append(header_tbl)
 
     if date_range:
         # Date range should not collide with the logo area; align it to the right.
         small_right = ParagraphStyle('small_right', parent=small_style, alignment=TA_RIGHT)
-        date_tbl = Table([["", Paragraph(date_range, small_right)]], colWidths=[28*mm, doc.width - 28*mm])
-        date_tbl.setStyle(TableStyle([
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (1,0), (1,0), 6),  # shift date slightly left
-            ('TOPPADDING', (0,0), (-1,-1), 0),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 0),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ]))
+        date_tbl = Table([["", Paragraph(date_range, small_right)]], colWidths=[_HEADER_SIDE_W, doc.width - _HEADER_SIDE_W])
+        date_tbl.setStyle(_DATE_TBL_STYLE)
         el.append(date_tbl)
         el.append(Spacer(1, 6))
     el.append(_header_divider(doc.width))
@@ -606,38 +762,64 @@ def build_diet_plan_pdf(path: str, payload: Dict[str, Any]) -> None:
     el.append(Spacer(1, 6))
     el.append(Spacer(1, 6))
 
-    full_name = (client.get("full_name") or "").strip() or "---"
-    phone = (client.get("phone") or "").strip() or "-"
-    birth = _fmt_tr_date((client.get("birth_date") or "").strip()) or "-"
-    gender = (client.get("gender") or "").strip() or "-"
-
     sections = payload.get("sections")
     if sections is None:
         sections = _parse_sections(plan.get("plan_text") or "")
 
-    sections = _normalize_sections_for_cards(sections)
+    # Callers passing per-meal sections can skip the legacy marker handling.
+    if not payload.get("sections_already_normalized"):
+        sections = _normalize_sections_for_cards(sections)
 
     if not sections:
         txt = (plan.get("plan_text") or "").strip()
         if txt:
             el.append(Paragraph("Plan", h_style))
-            for ln in txt.splitlines():
-                if ln.strip():
-                    el.append(Paragraph(ln.strip(), n_style))
+            el.append(Paragraph(_lines_para(txt), n_style))
     
     else:
         # Render each meal as a 'card' block to match the in-app preview.
         available_width = doc.width  # inside margins
+        widths = _meal_card_widths(available_width)
         for sec_title, items in sections:
-            card = _meal_card(font=font, sec_title=sec_title, items=items, available_width=available_width)
-            el.append(KeepTogether([card, Spacer(1, 6)]))
+            card = _meal_card(font=font, sec_title=sec_title, items=items, available_width=available_width, widths=widths)
+            # The card is a single-row outer table (never split), so it already
+            # moves to the next page whole; no KeepTogether dry-run layout needed.
+            el.append(card)
+            el.append(Spacer(1, 6))
 
     notes = (plan.get("notes") or "").strip()
     if notes:
         el.append(Spacer(1, 6))
         el.append(Paragraph("Notlar", h_style))
-        for ln in notes.splitlines():
-            if ln.strip():
-                el.append(Paragraph(ln.strip(), n_style))
+        el.append(Paragraph(_lines_para(notes), n_style))
+
+    # ReportLab serializes the whole PDF in memory and writes it to `path` with a
+    # single write() on save, so no extra BytesIO buffering is needed here.
+    doc.build(el, onFirstPage=draw_page_frame, onLaterPages=draw_page_frame)
+
+
+def _init_pdf_worker() -> None:
+    # Fonts are registered once per worker process, before its first job.
+    _register_fonts()
 
-    doc.build(el, onFirstPage=draw_page_frame, onLaterPages=draw_page_frame)
\ No newline at end of file
+
+def _build_job(job: Tuple[str, Dict[str, Any]]) -> str:
+    path, payload = job
+    build_diet_plan_pdf(path, payload)
+    return path
+
+
+def build_diet_plan_pdfs(jobs: List[Tuple[str, Dict[str, Any]]], max_workers: Optional[int] = None) -> List[str]:
+    """Build several diet plan PDFs in parallel worker processes.
+
+    doc.build is pure-Python CPU work (layout, line breaking, compression), so
+    threads would serialize on the GIL. Each job is (path, payload) as for
+    build_diet_plan_pdf; returns the written paths in job order. A single job
+    is built in-process. The first failing job's exception is re-raised.
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1:
+        return [_build_job(job) for job in jobs]
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker) as pool:
+        return list(pool.map(_build_job, jobs))
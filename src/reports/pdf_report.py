@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, date
+from functools import lru_cache
+import os
 from pathlib import Path
+import threading
 from typing import Optional
 
 from reportlab.lib.pagesizes import A4
@@ -16,8 +20,102 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.utils import ImageReader
 
 from src.app.utils.dates import format_tr_date
-from src.services.clients_service import ClientsService
-from src.services.measurements_service import MeasurementsService
+from src.services.clients_service import Client, ClientsService
+from src.services.measurements_service import Measurement, MeasurementsService
+
+
+# Renkler ve ölçüler: her raporda yeniden parse edilmesin diye modül seviyesinde.
+_ACCENT = colors.HexColor("#2F855A")   # NutriNexus hissi: sakin yeşil
+_SOFT_BG = colors.HexColor("#F5F7FA")
+_BORDER = colors.HexColor("#E3E6EA")
+_SLATE_900 = colors.HexColor("#0F172A")
+_SLATE_700 = colors.HexColor("#334155")
+_SLATE_600 = colors.HexColor("#64748B")
+_GREY_444 = colors.HexColor("#444444")
+_GREY_555 = colors.HexColor("#555555")
+_GREY_666 = colors.HexColor("#666666")
+
+_MARGIN_X = 18*mm
+_COL_W_FULL = 172*mm  # A4 - 2 * 18mm
+_CARD_W = (172*mm - 8*mm) / 3
+_LABEL_W, _VALUE_W = 36*mm, 136*mm
+_CALC_LABEL_W, _CALC_VALUE_W = 60*mm, 112*mm
+_HEADER_LOGO_W, _HEADER_TITLE_W = 44*mm, 128*mm
+_LOGO_MAX_W, _LOGO_MAX_H = 40*mm, 22*mm
+_SIG_W = A4[0] - 36*mm
+_SIG_Y_TOP = 50*mm  # imza bloğunun üst hizası
+_SIG_LINE_DX = 34*mm
+_SIG_VALUE_DX = 12*mm
+_FOOTER_LINE_Y = 14*mm
+_FOOTER_TEXT_Y = 8*mm
+_FOOTER_FORM = "nx_client_report_footer"  # sabit imza/alt bilgi Form XObject adı
+
+# Tablo stilleri bir kez kurulur ve her raporda paylaşılır. Fonta bağlı
+# FONTNAME komutu _font_style ile ayrıca uygulanır. ReportLab varsayılanına
+# (sol/sağ 6, üst/alt 3, VALIGN BOTTOM) eşit komutlar yazılmaz; sıfır
+# dolgular varsayılan değildir, korunur.
+_SECTION_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (-1,-1), _SOFT_BG),
+    ("BOX", (0,0), (-1,-1), 0.25, _BORDER),
+    ("LINEBEFORE", (0,0), (0,0), 3, _ACCENT),
+    ("LEFTPADDING", (0,0), (-1,-1), 10),
+    ("RIGHTPADDING", (0,0), (-1,-1), 10),
+    ("TOPPADDING", (0,0), (-1,-1), 4),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+])
+_CARD_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (-1,-1), colors.white),
+    ("BOX", (0,0), (-1,-1), 0.5, _BORDER),
+    ("TOPPADDING", (0,0), (-1,-1), 8),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 8),
+])
+_HEADER_TABLE_STYLE = TableStyle([
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("LEFTPADDING", (0,0), (-1,-1), 0),
+    ("RIGHTPADDING", (0,0), (-1,-1), 0),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 2),
+    ("TOPPADDING", (0,0), (-1,-1), 0),
+])
+_CLIENT_TABLE_STYLE = TableStyle([
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+    ("TEXTCOLOR", (0,0), (0,-1), _GREY_444),
+    ("BACKGROUND", (0,0), (0,-1), _SOFT_BG),
+    ("GRID", (0,0), (-1,-1), 0.25, _BORDER),
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("RIGHTPADDING", (0,0), (-1,-1), 8),
+    ("TOPPADDING", (0,0), (-1,-1), 4),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+])
+_MEAS_TABLE_STYLE = TableStyle([
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+    ("BACKGROUND", (0,0), (0,-1), _SOFT_BG),
+    ("GRID", (0,0), (-1,-1), 0.25, _BORDER),
+    ("RIGHTPADDING", (0,0), (-1,-1), 8),
+    ("TOPPADDING", (0,0), (-1,-1), 4),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+])
+_CALC_TABLE_STYLE = _MEAS_TABLE_STYLE  # aynı görünüm
+_CARDS_ROW_STYLE = TableStyle([
+    ("LEFTPADDING", (0,0), (-1,-1), 0),
+    ("RIGHTPADDING", (0,0), (-1,-1), 0),
+    ("TOPPADDING", (0,0), (-1,-1), 0),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 10),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+])
+
+
+# Sabit etiket sütunları: düz string hücreler (Paragraph kurulmaz), font/boyut
+# tablo stilinden gelir.
+_CLIENT_LABELS = ("Ad Soyad", "Telefon", "Doğum Tarihi", "Cinsiyet", "Yaş")
+_MEAS_LABELS = ("Boy (cm)", "Kilo (kg)", "Bel (cm)", "Kalça (cm)")
+_CALC_LABELS = ("BMR", "Kilo Ver (TDEE-500)", "Koruma (TDEE)", "Kilo Al (TDEE+300)")
+_LABEL_COL_WIDTHS = (_LABEL_W, _VALUE_W)
+_CALC_COL_WIDTHS = (_CALC_LABEL_W, _CALC_VALUE_W)
+
+
+@lru_cache(maxsize=4)
+def _font_style(font_name: str) -> TableStyle:
+    return TableStyle([("FONTNAME", (0,0), (-1,-1), font_name)])
 
 
 @dataclass(frozen=True)
@@ -31,18 +129,25 @@ class CalcSummary:
     gain: Optional[float]
 
 
+_ARIAL_CANDIDATES = (
+    r"C:\Windows\Fonts\arial.ttf",
+    r"C:\Windows\Fonts\Arial.ttf",
+)
+
+
+@lru_cache(maxsize=1)
 def _try_register_arial() -> str:
     """
     TR karakter sorunu yaşamamak için Arial tercih edilir.
+    Sonuç süreç boyunca önbelleklenir (font dosyası bir kez aranır/kaydedilir).
     ReportLab PDF içine fontu gömmek için TTF dosyası ister.
     Windows'ta genelde Arial şu yollarda bulunur:
       C:\\Windows\\Fonts\\arial.ttf
     """
-    candidates = [
-        r"C:\Windows\Fonts\arial.ttf",
-        r"C:\Windows\Fonts\Arial.ttf",
-    ]
-    for p in candidates:
+    # Başka bir modül zaten kaydettiyse TTF'i yeniden parse etmeyelim.
+    if "Arial" in pdfmetrics.getRegisteredFontNames():
+        return "Arial"
+    for p in _ARIAL_CANDIDATES:
         try:
             if Path(p).exists():
                 pdfmetrics.registerFont(TTFont("Arial", p))
@@ -54,9 +159,39 @@ def _try_register_arial() -> str:
     return "Helvetica"
 
 
+@lru_cache(maxsize=8)
+def _prepared_logo(path: str, mtime_ns: int, max_w: float, max_h: float,
+                   thread_id: int) -> tuple[ImageReader, float, float]:
+    """(reader, çizim genişliği, çizim yüksekliği); logo kutuya oran korunarak sığdırılır.
+    mtime anahtarda: logo değişirse yeniden okunur. ImageReader decode edilmiş
+    pikselleri kendi içinde tutar, ölçek de bir kez hesaplanır.
+    thread_id anahtarda: ImageReader thread-safe değil; GUI thread'i ve rapor
+    executor'u aynı reader'ı kilitsiz paylaşmasın diye her thread kendi reader'ını alır."""
+    ir = ImageReader(path)
+    iw, ih = ir.getSize()
+    if iw and ih:
+        scale = min(max_w/iw, max_h/ih)
+        return ir, iw*scale, ih*scale
+    return ir, max_w, max_h
+
+
+def _fmt_1(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.1f}"
+
+
+def _fmt_kcal(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.0f} kcal/gün"
+
+
 def _age_years(birth_iso_yyyy_mm_dd: str) -> int:
+    s = birth_iso_yyyy_mm_dd
     try:
-        b = datetime.strptime(birth_iso_yyyy_mm_dd, "%Y-%m-%d").date()
+        # Hızlı yol: sabit YYYY-MM-DD, strptime'ın format ayrıştırması olmadan.
+        if (isinstance(s, str) and len(s) == 10 and s[4] == "-" and s[7] == "-"
+                and s[0:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit()):
+            b = date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+        else:
+            b = datetime.strptime(s, "%Y-%m-%d").date()
     except Exception:
         return 0
     today = date.today()
@@ -68,139 +203,190 @@ def _age_years(birth_iso_yyyy_mm_dd: str) -> int:
 
 def _calc_summary(*, height_cm: Optional[float], weight_kg: Optional[float], age: int, gender: str,
                   activity_factor: float, adjust_kcal: int) -> CalcSummary:
+    # Tek geçiş: BMR yoksa TDEE türevleri de yok; koşullar bir kez kontrol edilir.
     bmi = None
     if height_cm and weight_kg and height_cm > 0:
         h_m = height_cm / 100.0
         bmi = weight_kg / (h_m * h_m)
 
-    bmr = None
-    if height_cm and weight_kg and age and height_cm > 0 and weight_kg > 0:
-        base = 10.0 * weight_kg + 6.25 * height_cm - 5.0 * age
-        if gender == "Erkek":
-            bmr = base + 5.0
-        else:
-            bmr = base - 161.0
-
-    tdee = (bmr * activity_factor) if bmr is not None else None
-    target = (tdee + adjust_kcal) if tdee is not None else None
+        if age and weight_kg > 0:
+            base = 10.0 * weight_kg + 6.25 * height_cm - 5.0 * age
+            bmr = base + (5.0 if gender == "Erkek" else -161.0)
+            tdee = bmr * activity_factor
+            return CalcSummary(bmi=bmi, bmr=bmr, tdee=tdee, target=tdee + adjust_kcal,
+                               loss=tdee - 500, maint=tdee, gain=tdee + 300)
 
-    loss = (tdee - 500) if tdee is not None else None
-    maint = tdee
-    gain = (tdee + 300) if tdee is not None else None
+    return CalcSummary(bmi=bmi, bmr=None, tdee=None, target=None, loss=None, maint=None, gain=None)
 
-    return CalcSummary(bmi=bmi, bmr=bmr, tdee=tdee, target=target, loss=loss, maint=maint, gain=gain)
-
-
-def build_client_report_pdf(
-    *,
-    conn,
-    client_id: str,
-    out_path: str | Path,
-    logo_path: str | Path | None = None,
-    activity_factor: float = 1.2,
-    goal_adjust_kcal: int = -500,
-) -> Path:
-    """
-    Profesyonel danışan raporu üretir (Sprint 3.7).
-    - Boy/kilo: son ölçümden otomatik
-    - Hesap: Mifflin–St Jeor (UI ile aynı)
-    - Tarih: TR format
-    """
-    out_path = Path(out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    font_name = _try_register_arial()
-    styles = getSampleStyleSheet()
+@lru_cache(maxsize=4)
+def _styles_for(font_name: str) -> dict[str, ParagraphStyle]:
+    """Rapor paragraf stilleri; font başına bir kez kurulur (her raporda yeniden değil)."""
+    base = getSampleStyleSheet()
+    styles: dict[str, ParagraphStyle] = {}
 
     # Kurumsal görünsün diye base stilleri düzenleyelim
-    styles.add(ParagraphStyle(
-        name="TitleTR",
-        parent=styles["Title"],
+    styles["TitleTR"] = ParagraphStyle(
+        "TitleTR",
+        parent=base["Title"],
         fontName=font_name,
         fontSize=14,
         leading=20,
         alignment=TA_LEFT,
         spaceAfter=6,
-    ))
-    styles.add(ParagraphStyle(
-        name="SubTitleTR",
-        parent=styles["Normal"],
+    )
+    styles["SubTitleTR"] = ParagraphStyle(
+        "SubTitleTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=10,
         leading=14,
-        textColor=colors.HexColor("#555555"),
-    ))
-    styles.add(ParagraphStyle(
-        name="H2TR",
-        parent=styles["Heading2"],
+        textColor=_GREY_555,
+    )
+    styles["H2TR"] = ParagraphStyle(
+        "H2TR",
+        parent=base["Heading2"],
         fontName=font_name,
         fontSize=12,
         leading=16,
         spaceBefore=10,
         spaceAfter=6,
-    ))
-    styles.add(ParagraphStyle(
-        name="NormalTR",
-        parent=styles["Normal"],
+    )
+    styles["NormalTR"] = ParagraphStyle(
+        "NormalTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=10,
         leading=14,
-    ))
-    styles.add(ParagraphStyle(
-        name="SmallTR",
-        parent=styles["Normal"],
+    )
+    styles["SmallTR"] = ParagraphStyle(
+        "SmallTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=9,
         leading=12,
-        textColor=colors.HexColor("#666666"),
-    ))
+        textColor=_GREY_666,
+    )
     # PDF görsel cilası: bölüm başlıkları, kart stilleri
-    styles.add(ParagraphStyle(
-        name="SectionTitleTR",
-        parent=styles["Normal"],
+    styles["SectionTitleTR"] = ParagraphStyle(
+        "SectionTitleTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=11,
         leading=14,
-        textColor=colors.HexColor("#0F172A"),
+        textColor=_SLATE_900,
         spaceBefore=0,
         spaceAfter=0,
-    ))
-    styles.add(ParagraphStyle(
-        name="CardValueTR",
-        parent=styles["Normal"],
+    )
+    styles["CardValueTR"] = ParagraphStyle(
+        "CardValueTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=16,
         leading=16,
         alignment=TA_CENTER,
-        textColor=colors.HexColor("#0F172A"),
+        textColor=_SLATE_900,
         spaceAfter=1,
-    ))
-    styles.add(ParagraphStyle(
-        name="CardLabelTR",
-        parent=styles["Normal"],
+    )
+    styles["CardLabelTR"] = ParagraphStyle(
+        "CardLabelTR",
+        parent=base["Normal"],
         fontName=font_name,
         fontSize=9,
         leading=11,
         alignment=TA_CENTER,
-        textColor=colors.HexColor("#64748B"),
-    ))
+        textColor=_SLATE_600,
+    )
+    return styles
 
-    client_svc = ClientsService(conn)
-    meas_svc = MeasurementsService(conn)
 
-    client = client_svc.get_client(client_id)
+def _load_report_inputs(conn, client_id: str) -> tuple[Client, Optional[Measurement]]:
+    """Rapor için gereken DB okumaları; SQLite bağlantısının sahibi olan thread'de çalışır."""
+    client = ClientsService(conn).get_client(client_id)
     if client is None:
         raise ValueError("Danışan bulunamadı.")
+    return client, MeasurementsService(conn).latest_for_client(client_id)
+
+
+def build_client_report_pdf(
+    *,
+    conn,
+    client_id: str,
+    out_path: str | Path,
+    logo_path: str | Path | None = None,
+    activity_factor: float = 1.2,
+    goal_adjust_kcal: int = -500,
+) -> Path:
+    """
+    Profesyonel danışan raporu üretir (Sprint 3.7).
+    - Boy/kilo: son ölçümden otomatik
+    - Hesap: Mifflin–St Jeor (UI ile aynı)
+    - Tarih: TR format
+    """
+    client, last = _load_report_inputs(conn, client_id)
+    return _render_client_report(
+        client=client, last=last, out_path=out_path, logo_path=logo_path,
+        activity_factor=activity_factor, goal_adjust_kcal=goal_adjust_kcal,
+    )
+
+
+@lru_cache(maxsize=1)
+def _report_executor() -> ThreadPoolExecutor:
+    # Tek worker: raporlar sırayla üretilir, UI thread'i bloklanmaz.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="nx-client-report")
+
+
+def build_client_report_pdf_async(
+    *,
+    conn,
+    client_id: str,
+    out_path: str | Path,
+    logo_path: str | Path | None = None,
+    activity_factor: float = 1.2,
+    goal_adjust_kcal: int = -500,
+) -> Future:
+    """
+    build_client_report_pdf'in arka plan sürümü; sonucu (Path) taşıyan bir Future döner.
+    DB okumaları çağıran thread'de yapılır (SQLite thread bağımlılığı), yalnızca
+    story kurulumu ve doc.build worker thread'de çalışır.
+    """
+    client, last = _load_report_inputs(conn, client_id)
+    # Font kaydı global ReportLab durumunu değiştirir; worker'a bırakmayalım.
+    _try_register_arial()
+    return _report_executor().submit(
+        _render_client_report,
+        client=client, last=last, out_path=out_path, logo_path=logo_path,
+        activity_factor=activity_factor, goal_adjust_kcal=goal_adjust_kcal,
+    )
+
+
+def _render_client_report(
+    *,
+    client: Client,
+    last: Optional[Measurement],
+    out_path: str | Path,
+    logo_path: str | Path | None,
+    activity_factor: float,
+    goal_adjust_kcal: int,
+) -> Path:
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    last = meas_svc.latest_for_client(client_id)
+    font_name = _try_register_arial()
+    styles = _styles_for(font_name)
 
     # Data hazırlığı
     now = datetime.now().replace(microsecond=0)
-    report_date_tr = format_tr_date(now.date().isoformat())
-
-    height = getattr(last, "height_cm", None) if last else None
-    weight = getattr(last, "weight_kg", None) if last else None
-    measured_at = getattr(last, "measured_at", None) if last else None
+    report_date_tr = format_tr_date(now)
+    # İmza alanındaki tarih: sayfa başına değil, rapor başına bir kez hesaplanır.
+    today_tr = now.strftime("%d.%m.%Y")
+
+    # Measurement bir dataclass: alanlar bir kez, doğrudan okunur.
+    if last is not None:
+        height, weight, measured_at = last.height_cm, last.weight_kg, last.measured_at
+        waist, hip = last.waist_cm, last.hip_cm
+    else:
+        height = weight = measured_at = waist = hip = None
 
     age = _age_years(client.birth_date)
     gender = client.gender
@@ -213,42 +399,23 @@ def build_client_report_pdf(
     doc = SimpleDocTemplate(
         str(out_path),
         pagesize=A4,
-        leftMargin=18*mm, rightMargin=18*mm, topMargin=16*mm, bottomMargin=55*mm,
+        leftMargin=_MARGIN_X, rightMargin=_MARGIN_X, topMargin=16*mm, bottomMargin=55*mm,
         title="NutriNexus Danışan Raporu",
         author="NutriNexus",
     )
 
     story = []
 
-    ACCENT = colors.HexColor("#2F855A")   # NutriNexus hissi: sakin yeşil
-    SOFT_BG = colors.HexColor("#F5F7FA")
-    BORDER = colors.HexColor("#E3E6EA")
-
     def _section(title: str):
         """Kurumsal bölüm başlığı (arka plan + sol aksan)."""
-        t = Table([[Paragraph(title, styles["SectionTitleTR"])]], colWidths=[172*mm])
-        t.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), SOFT_BG),
-            ("BOX", (0,0), (-1,-1), 0.25, BORDER),
-            ("LINEBEFORE", (0,0), (0,0), 3, ACCENT),
-            ("LEFTPADDING", (0,0), (-1,-1), 10),
-            ("RIGHTPADDING", (0,0), (-1,-1), 10),
-            ("TOPPADDING", (0,0), (-1,-1), 4),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-        ]))
+        t = Table([[Paragraph(title, styles["SectionTitleTR"])]], colWidths=[_COL_W_FULL])
+        t.setStyle(_SECTION_STYLE)
         return t
 
     def _card(value: str, label: str):
         c = Table([[Paragraph(value, styles["CardValueTR"])],
-                   [Paragraph(label, styles["CardLabelTR"])]], colWidths=[(172*mm-8*mm)/3])
-        c.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.white),
-            ("BOX", (0,0), (-1,-1), 0.5, BORDER),
-            ("LEFTPADDING", (0,0), (-1,-1), 6),
-            ("RIGHTPADDING", (0,0), (-1,-1), 6),
-            ("TOPPADDING", (0,0), (-1,-1), 8),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 8),
-        ]))
+                   [Paragraph(label, styles["CardLabelTR"])]], colWidths=[_CARD_W])
+        c.setStyle(_CARD_STYLE)
         return c
 
     # Header: Logo + Başlık
@@ -257,59 +424,43 @@ def build_client_report_pdf(
     if logo_path and Path(logo_path).exists():
         try:
             # Logoyu bozmadan (oran koruyarak) kutuya sığdır
-            max_w, max_h = 40*mm, 22*mm
-            ir = ImageReader(str(logo_path))
-            iw, ih = ir.getSize()
-            if iw and ih:
-                scale = min(max_w/iw, max_h/ih)
-                w, h = iw*scale, ih*scale
-            else:
-                w, h = max_w, max_h
-            img = Image(str(logo_path), width=w, height=h)
+            logo_str = str(logo_path)
+            ir, w, h = _prepared_logo(logo_str, os.stat(logo_str).st_mtime_ns,
+                                      _LOGO_MAX_W, _LOGO_MAX_H, threading.get_ident())
+            img = Image(logo_str, width=w, height=h)
+            # Image dosyayı _img üzerinden tembel açar; önbellekteki reader'ı
+            # verirsek PNG her raporda yeniden açılıp decode edilmez.
+            # Bilerek özel öznitelik: Image ImageReader kabul etmiyor (ReportLab 5'te
+            # TypeError); requirements.txt'de ReportLab sürümü sabitlendi.
+            img._img = ir
             img.hAlign = "LEFT"
             logo_cell = img
         except Exception:
             logo_cell = ""
     header_tbl_data.append([logo_cell, Paragraph("Danışan Raporu", styles["TitleTR"])])
 
-    header_tbl = Table(header_tbl_data, colWidths=[44*mm, 128*mm])
-    header_tbl.setStyle(TableStyle([
-        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-        ("LEFTPADDING", (0,0), (-1,-1), 0),
-        ("RIGHTPADDING", (0,0), (-1,-1), 0),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 2),
-        ("TOPPADDING", (0,0), (-1,-1), 0),
-    ]))
+    header_tbl = Table(header_tbl_data, colWidths=[_HEADER_LOGO_W, _HEADER_TITLE_W])
+    header_tbl.setStyle(_HEADER_TABLE_STYLE)
     story.append(header_tbl)
 
     story.append(Paragraph(f"Rapor Tarihi: <b>{report_date_tr}</b>", styles["SubTitleTR"]))
     story.append(Spacer(1, 6))
-    story.append(HRFlowable(width="100%", thickness=1.6, color=ACCENT))
+    story.append(HRFlowable(width="100%", thickness=1.6, color=_ACCENT))
     story.append(Spacer(1, 6))
 
     # Danışan Bilgileri
     story.append(_section("Danışan Bilgileri"))
 
-    client_table = Table([
-        ["Ad Soyad", client.full_name],
-        ["Telefon", client.phone],
-        ["Doğum Tarihi", format_tr_date(client.birth_date) if client.birth_date else ""],
-        ["Cinsiyet", client.gender],
-        ["Yaş", str(age)],
-    ], colWidths=[36*mm, 136*mm])
-
-    client_table.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), font_name),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-        ("TEXTCOLOR", (0,0), (0,-1), colors.HexColor("#444444")),
-        ("BACKGROUND", (0,0), (0,-1), colors.HexColor("#F5F7FA")),
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#E3E6EA")),
-        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-        ("LEFTPADDING", (0,0), (-1,-1), 6),
-        ("RIGHTPADDING", (0,0), (-1,-1), 8),
-        ("TOPPADDING", (0,0), (-1,-1), 4),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-    ]))
+    client_table = Table(list(zip(_CLIENT_LABELS, (
+        client.full_name,
+        client.phone,
+        format_tr_date(client.birth_date) if client.birth_date else "",
+        client.gender,
+        str(age),
+    ))), colWidths=_LABEL_COL_WIDTHS)
+
+    client_table.setStyle(_CLIENT_TABLE_STYLE)
+    client_table.setStyle(_font_style(font_name))
     story.append(client_table)
     story.append(Spacer(1, 6))
 
@@ -324,22 +475,11 @@ def build_client_report_pdf(
             f"Boy/Kilo ölçüm kaydından otomatik alınmıştır.",
             styles["SmallTR"]
         ))
-        meas_table = Table([
-            ["Boy (cm)", f"{height:.1f}" if height is not None else "-"],
-            ["Kilo (kg)", f"{weight:.1f}" if weight is not None else "-"],
-            ["Bel (cm)", f"{getattr(last,'waist_cm', None):.1f}" if getattr(last,'waist_cm', None) is not None else "-"],
-            ["Kalça (cm)", f"{getattr(last,'hip_cm', None):.1f}" if getattr(last,'hip_cm', None) is not None else "-"],
-        ], colWidths=[36*mm, 136*mm])
-        meas_table.setStyle(TableStyle([
-            ("FONTNAME", (0,0), (-1,-1), font_name),
-            ("FONTSIZE", (0,0), (-1,-1), 9),
-            ("BACKGROUND", (0,0), (0,-1), colors.HexColor("#F5F7FA")),
-            ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#E3E6EA")),
-            ("LEFTPADDING", (0,0), (-1,-1), 6),
-            ("RIGHTPADDING", (0,0), (-1,-1), 8),
-            ("TOPPADDING", (0,0), (-1,-1), 4),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-        ]))
+        meas_table = Table(list(zip(_MEAS_LABELS, (
+            _fmt_1(height), _fmt_1(weight), _fmt_1(waist), _fmt_1(hip),
+        ))), colWidths=_LABEL_COL_WIDTHS)
+        meas_table.setStyle(_MEAS_TABLE_STYLE)
+        meas_table.setStyle(_font_style(font_name))
         story.append(meas_table)
 
     story.append(Spacer(1, 6))
@@ -353,51 +493,36 @@ def build_client_report_pdf(
     story.append(Spacer(1, 6))
 
 
-    # Özet kartlar (danışana premium hissi verir)
-    bmi_txt = "-" if calc.bmi is None else f"{calc.bmi:.1f}"
-    tdee_txt = "-" if calc.tdee is None else f"{calc.tdee:.0f}"
-    target_txt = "-" if calc.target is None else f"{calc.target:.0f}"
-
-    cards = Table([[
-        _card(bmi_txt, "BMI"),
-        _card(f"{tdee_txt} kcal", "TDEE (Günlük Enerji)"),
-        _card(f"{target_txt} kcal", "Hedef Kalori"),
-    ]], colWidths=[(172*mm-8*mm)/3]*3)
-    cards.setStyle(TableStyle([
-        ("LEFTPADDING", (0,0), (-1,-1), 0),
-        ("RIGHTPADDING", (0,0), (-1,-1), 0),
-        ("TOPPADDING", (0,0), (-1,-1), 0),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 10),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-    ]))
-    story.append(cards)
-    def _fmt_kcal(v: Optional[float]) -> str:
-        return "-" if v is None else f"{v:.0f} kcal/gün"
-
-    calc_table = Table([
-        ["BMI", "-" if calc.bmi is None else f"{calc.bmi:.1f}"],
-        ["BMR", _fmt_kcal(calc.bmr)],
-        ["TDEE", _fmt_kcal(calc.tdee)],
-        ["Hedef Kalori", _fmt_kcal(calc.target)],
-        ["Kilo Ver (TDEE-500)", _fmt_kcal(calc.loss)],
-        ["Koruma (TDEE)", _fmt_kcal(calc.maint)],
-        ["Kilo Al (TDEE+300)", _fmt_kcal(calc.gain)],
-    ], colWidths=[60*mm, 112*mm])
-
-    calc_table.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), font_name),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-        ("BACKGROUND", (0,0), (0,-1), colors.HexColor("#F5F7FA")),
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#E3E6EA")),
-        ("LEFTPADDING", (0,0), (-1,-1), 6),
-        ("RIGHTPADDING", (0,0), (-1,-1), 8),
-        ("TOPPADDING", (0,0), (-1,-1), 4),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-    ]))
-    story.append(calc_table)
+    if calc.bmi is None:
+        # Boy/kilo yoksa tüm değerler "-" olurdu: kart ve tablo yerine tek satır.
+        story.append(Paragraph(
+            "Hesaplama için son ölçümde boy ve kilo bilgisi gereklidir.",
+            styles["NormalTR"]
+        ))
+    else:
+        # Özet kartlar (danışana premium hissi verir)
+        bmi_txt = f"{calc.bmi:.1f}"
+        tdee_txt = "-" if calc.tdee is None else f"{calc.tdee:.0f}"
+        target_txt = "-" if calc.target is None else f"{calc.target:.0f}"
+
+        cards = Table([[
+            _card(bmi_txt, "BMI"),
+            _card(f"{tdee_txt} kcal", "TDEE (Günlük Enerji)"),
+            _card(f"{target_txt} kcal", "Hedef Kalori"),
+        ]], colWidths=[_CARD_W]*3)
+        cards.setStyle(_CARDS_ROW_STYLE)
+        story.append(cards)
+        # BMI / TDEE / Hedef Kalori yukarıdaki kartlarda; tabloda tekrar edilmez.
+        calc_table = Table(list(zip(_CALC_LABELS, (
+            _fmt_kcal(calc.bmr), _fmt_kcal(calc.loss), _fmt_kcal(calc.maint), _fmt_kcal(calc.gain),
+        ))), colWidths=_CALC_COL_WIDTHS)
+
+        calc_table.setStyle(_CALC_TABLE_STYLE)
+        calc_table.setStyle(_font_style(font_name))
+        story.append(calc_table)
 
     story.append(Spacer(1, 14))
-    story.append(HRFlowable(width="100%", thickness=0.8, color=BORDER))
+    story.append(HRFlowable(width="100%", thickness=0.8, color=_BORDER))
     story.append(Spacer(1, 6))
     story.append(Paragraph(
         "Not: Bu rapor NutriNexus tarafından danışan verilerine dayanarak oluşturulmuştur. "
@@ -406,50 +531,73 @@ def build_client_report_pdf(
     ))
     # (Tek sayfa için) Rapor sonunda spacer bırakmıyoruz; boş sayfa oluşmasını engeller.
     # Uzman onayı / imza alanı sayfanın altına sabit olarak çizilir (footer).
-    def _on_page(canvas, doc_):
-        canvas.saveState()
+    def _draw_static_footer(canvas):
         # --- Uzman Onayı / İmza (tek sayfa garantisi için sabit alana çizilir) ---
         # Bu alan için bottomMargin yukarıda geniş tutulur.
-        sig_x = 18*mm
-        sig_w = A4[0] - 36*mm
-        sig_y_top = 50*mm  # imza bloğunun üst hizası (mm)
-        # Başlık
-        canvas.setFont(font_name, 10)
-        canvas.setFillColor(colors.HexColor("#0F172A"))
-        canvas.drawString(sig_x, sig_y_top + 12, "Uzman Onayı")
-        # İnce ayraç çizgisi
-        canvas.setStrokeColor(BORDER)
-        canvas.setLineWidth(0.6)
-        canvas.line(sig_x, sig_y_top + 8, sig_x + sig_w, sig_y_top + 8)
-
-        canvas.setFont(font_name, 9)
-        canvas.setFillColor(colors.HexColor("#334155"))
-
+        # Aynı renk/font durumunu paylaşan çizimler gruplanır: önce tüm çizgiler
+        # tek path olarak, sonra renk/font başına yazılar.
+        sig_x = _MARGIN_X
+        sig_x2 = sig_x + _SIG_W
+        sig_y_top = _SIG_Y_TOP
         row_y1 = sig_y_top - 2
-        canvas.drawString(sig_x, row_y1, "Uzman / Diyetisyen:")
-        canvas.setStrokeColor(BORDER)
-        canvas.line(sig_x + 34*mm, row_y1 - 2, sig_x + sig_w, row_y1 - 2)
-
-        row_y2 = sig_y_top - 14
-        canvas.setFillColor(colors.HexColor("#334155"))
-        canvas.drawString(sig_x, row_y2, "Tarih:")
-        canvas.setFillColor(colors.HexColor("#0F172A"))
-        canvas.drawString(sig_x + 12*mm, row_y2, datetime.now().strftime("%d.%m.%Y"))
-
         row_y3 = sig_y_top - 28
-        canvas.setFillColor(colors.HexColor("#334155"))
-        canvas.drawString(sig_x, row_y3, "İmza:")
-        canvas.setStrokeColor(BORDER)
-        canvas.line(sig_x + 12*mm, row_y3 - 2, sig_x + sig_w, row_y3 - 2)
-        # Alt bilgi şeridi
-        canvas.setStrokeColor(BORDER)
+
+        canvas.setStrokeColor(_BORDER)
         canvas.setLineWidth(0.6)
-        canvas.line(18*mm, 14*mm, A4[0]-18*mm, 14*mm)
+        path = canvas.beginPath()
+        # İnce ayraç çizgisi
+        path.moveTo(sig_x, sig_y_top + 8)
+        path.lineTo(sig_x2, sig_y_top + 8)
+        # Uzman / Diyetisyen ve İmza satır çizgileri
+        path.moveTo(sig_x + _SIG_LINE_DX, row_y1 - 2)
+        path.lineTo(sig_x2, row_y1 - 2)
+        path.moveTo(sig_x + _SIG_VALUE_DX, row_y3 - 2)
+        path.lineTo(sig_x2, row_y3 - 2)
+        # Alt bilgi şeridi
+        path.moveTo(_MARGIN_X, _FOOTER_LINE_Y)
+        path.lineTo(A4[0] - _MARGIN_X, _FOOTER_LINE_Y)
+        canvas.drawPath(path, stroke=1, fill=0)
 
+        # Tüm sabit yazılar tek TextObject (tek BT/ET bloğu) içinde.
+        text = canvas.beginText(sig_x, sig_y_top + 12)
+        # Başlık
+        text.setFont(font_name, 10)
+        text.setFillColor(_SLATE_900)
+        text.textOut("Uzman Onayı")
+
+        text.setFont(font_name, 9)
+        text.setFillColor(_SLATE_700)
+        text.setTextOrigin(sig_x, row_y1)
+        text.textOut("Uzman / Diyetisyen:")
+        text.setTextOrigin(sig_x, sig_y_top - 14)
+        text.textOut("Tarih:")
+        text.setTextOrigin(sig_x, row_y3)
+        text.textOut("İmza:")
+
+        text.setFillColor(_SLATE_600)
+        text.setTextOrigin(_MARGIN_X, _FOOTER_TEXT_Y)
+        text.textOut("NutriNexus • Danışan Raporu")
+        canvas.drawText(text)
+
+    footer_defined = False
+
+    def _on_page(canvas, doc_):
+        nonlocal footer_defined
+        # Sabit imza/alt bilgi bloğu ilk sayfada Form XObject olarak tanımlanır;
+        # sonraki sayfalar yalnızca doForm ile referans verir.
+        if not footer_defined:
+            canvas.beginForm(_FOOTER_FORM)
+            _draw_static_footer(canvas)
+            canvas.endForm()
+            footer_defined = True
+        canvas.doForm(_FOOTER_FORM)
+        # Dinamik kısım: tarih ve sayfa numarası
+        canvas.saveState()
         canvas.setFont(font_name, 9)
-        canvas.setFillColor(colors.HexColor("#64748B"))
-        canvas.drawString(18*mm, 8*mm, "NutriNexus • Danışan Raporu")
-        canvas.drawRightString(A4[0] - 18*mm, 8*mm, f"Sayfa {doc_.page}")
+        canvas.setFillColor(_SLATE_900)
+        canvas.drawString(_MARGIN_X + _SIG_VALUE_DX, _SIG_Y_TOP - 14, today_tr)
+        canvas.setFillColor(_SLATE_600)
+        canvas.drawRightString(A4[0] - _MARGIN_X, _FOOTER_TEXT_Y, f"Sayfa {doc_.page}")
         canvas.restoreState()
 
     doc.build(story, onFirstPage=_on_page, onLaterPages=_on_page)
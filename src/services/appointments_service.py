@@ -1,38 +1,61 @@
 from __future__ import annotations
 
-def _row_get(row, key, default=""):
-    """Safe getter for sqlite3.Row / dict-like objects."""
-    try:
-        if hasattr(row, "keys") and key in row.keys():
-            return row[key]
-        if isinstance(row, dict):
-            return row.get(key, default)
-        return getattr(row, key, default)
-    except Exception:
-        return default
-
-
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from uuid import uuid4
 
 from src.app.utils.dates import format_tr_date
 
+_DEFAULT_STATUS = "Planlandı"
+
 def _now_iso() -> str:
     return datetime.now().replace(microsecond=0).isoformat(sep=" ")
 
-def _parse_iso_dt(s: str) -> datetime:
-    # Stored as "YYYY-MM-DD HH:MM:SS" (or without seconds) — be forgiving.
-    s = (s or "").strip()
+def _prefix_range(prefix: str) -> tuple[str, str]:
+    """[lo, hi) bounds for `starts_at LIKE prefix || '%'` as an indexable range.
+
+    Equivalent to `substr(starts_at, 1, len(prefix)) = prefix`: every string
+    that starts with the prefix sorts between the prefix itself and the
+    prefix with its last character bumped (e.g. '2024-01-31' -> '2024-01-32').
+    An empty prefix gives an empty range (no rows), like the old `substr(...) <= ''`.
+    """
+    if not prefix:
+        return prefix, prefix
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _day_span(first_day: str, last_day: str) -> tuple[str, str]:
+    """[lo, hi) covering every starts_at whose date is within first_day..last_day."""
+    return first_day, _prefix_range(last_day)[1]
+
+@lru_cache(maxsize=4096)
+def _parse_iso_dt_cached(s: str) -> Optional[datetime]:
+    # Lists repeat the same start times across renders; datetime is immutable
+    # so parsed values are shared. Failures return None (not cached as "now").
     for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
         try:
             return datetime.strptime(s, fmt)
         except Exception:
             pass
-    # fallback
-    return datetime.now().replace(microsecond=0)
+    return None
+
+def _parse_iso_dt(s: str) -> datetime:
+    # Stored as "YYYY-MM-DD HH:MM:SS" (or without seconds) — be forgiving.
+    dt = _parse_iso_dt_cached((s or "").strip())
+    if dt is None:
+        # fallback
+        return datetime.now().replace(microsecond=0)
+    return dt
+
+@lru_cache(maxsize=4096)
+def _ui_date_time_cached(s: str) -> Optional[tuple[str, str]]:
+    """(DD.MM.YYYY, HH:MM) for a stored starts_at; None if it does not parse."""
+    dt = _parse_iso_dt_cached(s)
+    if dt is None:
+        return None
+    return format_tr_date(dt), dt.strftime("%H:%M")
 
 @dataclass
 class Appointment:
@@ -50,15 +73,17 @@ class Appointment:
     updated_at: str = ""
 
     def to_ui_dict(self, client_name: str = "") -> dict:
-        dt = _parse_iso_dt(self.starts_at)
-        date_iso = dt.strftime("%Y-%m-%d")
+        parts = _ui_date_time_cached((self.starts_at or "").strip())
+        if parts is None:
+            dt = _parse_iso_dt(self.starts_at)
+            parts = (format_tr_date(dt), dt.strftime("%H:%M"))
         return {
             "id": self.id,
             "client_id": self.client_id,
             "client_name": client_name,
             "starts_at": self.starts_at,
-            "date": format_tr_date(date_iso),
-            "time": dt.strftime("%H:%M"),
+            "date": parts[0],
+            "time": parts[1],
             "duration_min": int(self.duration_min or 0),
             "title": self.title or "",
             "note": self.note or "",
@@ -67,108 +92,221 @@ class Appointment:
             "is_active": bool(self.is_active),
         }
 
+# Sabit SQL metinleri: sqlite3 hazırlanmış ifadeleri (Connection başına LRU,
+# cached_statements) SQL metnine göre önbellekler. Metinler modül sabiti
+# olduğunda her çağrı aynı ifadeye düşer; liste sorgusunun iki biçimi de
+# (arama var/yok) önceden kurulur.
+_LIST_SQL_BASE = (
+    "SELECT a.id, a.client_id, a.starts_at, a.duration_min, a.title, a.note, a.phone, a.status, a.notified, a.is_active, a.created_at, a.updated_at, "
+    "c.full_name AS client_name "
+    "FROM appointments a "
+    "JOIN clients c ON c.id = a.client_id "
+    "WHERE a.is_active = 1 AND a.starts_at >= ? AND a.starts_at < ? "
+)
+_LIST_SQL = _LIST_SQL_BASE + "ORDER BY a.starts_at ASC"
+_LIST_SQL_QUERY = (
+    _LIST_SQL_BASE
+    # LIKE zaten ASCII büyük/küçük harf duyarsız; lower() da yalnızca ASCII'yi
+    # çevirdiği için satır başına lower() çağrısı sonucu değiştirmez.
+    + "AND (c.full_name LIKE ? OR a.title LIKE ? OR a.note LIKE ?) "
+    + "ORDER BY a.starts_at ASC"
+)
+_GET_SQL = (
+    "SELECT id, client_id, starts_at, duration_min, title, note, phone, status, is_active, created_at, updated_at "
+    "FROM appointments WHERE id=?"
+)
+_INSERT_SQL = (
+    "INSERT INTO appointments(id, client_id, starts_at, duration_min, title, note, phone, status, notified, is_active, created_at, updated_at) "
+    "VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
+)
+_UPDATE_SQL = (
+    "UPDATE appointments SET client_id=?, starts_at=?, duration_min=?, title=?, note=?, phone=?, status=?, "
+    "notified=CASE WHEN ?=1 THEN 0 ELSE notified END, updated_at=? WHERE id=?"
+)
+_COUNTS_BY_DAY_SQL = """
+    SELECT substr(starts_at,1,10) AS d, COUNT(*) AS cnt
+    FROM appointments
+    WHERE is_active=1 AND starts_at >= ? AND starts_at < ?
+    GROUP BY substr(starts_at,1,10)
+"""
+# Tooltip satırı ('09:00 — Ayşe Kaya • Kontrol') SQLite içinde birleştirilir;
+# trim() karakter kümesi Python'daki strip() ile aynı ASCII boşlukları kapsar.
+_TOOLTIPS_BY_DAY_SQL = """
+    SELECT d,
+           t || CASE WHEN name <> '' THEN ' — ' || name ELSE '' END
+             || CASE WHEN title <> '' THEN ' • ' || title ELSE '' END AS line
+    FROM (
+        SELECT substr(a.starts_at,1,10) AS d,
+               COALESCE(substr(a.starts_at,12,5),'') AS t,
+               trim(COALESCE(c.full_name,''), char(32,9,10,11,12,13)) AS name,
+               trim(COALESCE(a.title,''), char(32,9,10,11,12,13)) AS title,
+               a.starts_at AS starts_at
+        FROM appointments a
+        LEFT JOIN clients c ON c.id = a.client_id
+        WHERE a.is_active=1 AND a.starts_at >= ? AND a.starts_at < ?
+    )
+    ORDER BY starts_at ASC
+"""
+_DUE_SQL = """
+    SELECT a.id,
+           a.client_id,
+           substr(a.starts_at, 1, 10) AS date,
+           substr(a.starts_at, 12, 5) AS time,
+           a.duration_min,
+           a.title,
+           a.note,
+           a.status,
+           COALESCE(a.phone,'') AS phone,
+           COALESCE(c.full_name,'') AS client_name,
+           a.starts_at
+    FROM appointments a
+    LEFT JOIN clients c ON c.id = a.client_id
+    WHERE a.is_active=1 AND a.notified=0
+      AND a.starts_at >= ? AND a.starts_at < ?
+      AND datetime(a.starts_at) >= datetime(?)
+      AND datetime(a.starts_at) <  datetime(?)
+    ORDER BY a.starts_at ASC
+"""
+
+def _list_row_to_ui(r) -> dict:
+    """List row -> UI dict (same shape as Appointment.to_ui_dict), without the
+    intermediate dataclass. Columns come from _LIST_SQL, so plain r[...] access."""
+    starts_at = r["starts_at"]
+    parts = _ui_date_time_cached((starts_at or "").strip())
+    if parts is None:
+        dt = _parse_iso_dt(starts_at)
+        parts = (format_tr_date(dt), dt.strftime("%H:%M"))
+    return {
+        "id": r["id"],
+        "client_id": r["client_id"],
+        "client_name": r["client_name"] or "",
+        "starts_at": starts_at,
+        "date": parts[0],
+        "time": parts[1],
+        "duration_min": int(r["duration_min"] or 0),
+        "title": r["title"] or "",
+        "note": r["note"] or "",
+        "phone": r["phone"] or "",
+        "status": r["status"] or "Planlandı",
+        "is_active": True,  # _LIST_SQL filters a.is_active = 1
+    }
+
+def _tooltips_from_lines(by_day: dict[str, list[str]], max_items: int) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for d, items in by_day.items():
+        head = items[: max_items]
+        more = len(items) - len(head)
+        text = "\n".join(head)
+        if more > 0:
+            text += f"\n+{more} randevu daha..."
+        out[d] = text
+    return out
+
 class AppointmentsService:
-    """Sprint 6.0: Randevularım (liste + CRUD)."""
+    """Sprint 6.0: Randevularım (liste + CRUD).
 
-    VALID_STATUS = ["Planlandı", "Tamamlandı", "İptal"]
+    Write methods take an optional `now_iso` ('YYYY-MM-DD HH:MM:SS'): batch
+    callers can stamp many rows with one snapshot instead of one clock read
+    per call. Omitted, the current time is used as before.
+    """
+
+    VALID_STATUS = frozenset((_DEFAULT_STATUS, "Tamamlandı", "İptal"))
 
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
     def list_appointments(self, *, date_from: str, date_to: str, query: str = "") -> list[dict]:
-        # date_from/date_to are YYYY-MM-DD. We filter by starts_at.
+        return list(self.iter_appointments(date_from=date_from, date_to=date_to, query=query))
+
+    def iter_appointments(self, *, date_from: str, date_to: str, query: str = "") -> Iterator[dict]:
+        """Same rows as list_appointments, yielded straight from the cursor.
+
+        Callers that stop early (e.g. "is this day empty?") only materialize
+        the rows they consume.
+        """
+        # date_from/date_to are YYYY-MM-DD. We filter by starts_at as a range
+        # (index on is_active, starts_at); date_to is inclusive of the whole day.
         q = (query or "").strip().lower()
-        where = ["a.is_active = 1", "substr(a.starts_at,1,10) >= ?", "substr(a.starts_at,1,10) <= ?"]
-        params: list[object] = [date_from, date_to]
+        upper = _prefix_range(date_to)[1]
         if q:
-            where.append("(lower(c.full_name) LIKE ? OR lower(a.title) LIKE ? OR lower(a.note) LIKE ?)")
-            params.extend([f"%{q}%", f"%{q}%", f"%{q}%"])
-
-        sql = (
-            "SELECT a.id, a.client_id, a.starts_at, a.duration_min, a.title, a.note, a.phone, a.status, a.notified, a.is_active, a.created_at, a.updated_at, "
-            "c.full_name AS client_name "
-            "FROM appointments a "
-            "JOIN clients c ON c.id = a.client_id "
-            "WHERE " + " AND ".join(where) + " "
-            "ORDER BY a.starts_at ASC"
-        )
-        rows = self.conn.execute(sql, params).fetchall()
-        out: list[dict] = []
-        for r in rows:
-            ap = Appointment(
-                id=r["id"], client_id=r["client_id"], starts_at=r["starts_at"],
-                duration_min=int(r["duration_min"] or 0),
-                title=r["title"] or "", note=r["note"] or "", phone=_row_get(r, "phone", "") or "",
-                status=r["status"] or "Planlandı",
-                is_active=int(r["is_active"] or 1),
-                created_at=r["created_at"] or "", updated_at=r["updated_at"] or "",
-            )
-            out.append(ap.to_ui_dict(client_name=r["client_name"] or ""))
-        return out
+            like = f"%{q}%"
+            cur = self.conn.execute(_LIST_SQL_QUERY, (date_from, upper, like, like, like))
+        else:
+            cur = self.conn.execute(_LIST_SQL, (date_from, upper))
+        for r in cur:
+            yield _list_row_to_ui(r)
 
     def get_appointment(self, appt_id: str) -> Optional[Appointment]:
-        r = self.conn.execute(
-            "SELECT id, client_id, starts_at, duration_min, title, note, phone, status, is_active, created_at, updated_at "
-            "FROM appointments WHERE id=?",
-            (appt_id,),
-        ).fetchone()
+        r = self.conn.execute(_GET_SQL, (appt_id,)).fetchone()
         if not r:
             return None
         return Appointment(**dict(r))
 
     def create_appointment(
-        self, *, client_id: str, starts_at: str, duration_min: int, title: str, note: str, phone: str, status: str
+        self, *, client_id: str, starts_at: str, duration_min: int, title: str, note: str, phone: str, status: str,
+        now_iso: Optional[str] = None,
     ) -> Appointment:
-        appt_id = str(uuid4())
-        now = _now_iso()
-        st = status if status in self.VALID_STATUS else "Planlandı"
+        appt_id = uuid4().hex
+        now = now_iso or _now_iso()
+        st = status if status in self.VALID_STATUS else _DEFAULT_STATUS
+        ap = Appointment(
+            id=appt_id, client_id=client_id, starts_at=starts_at, duration_min=int(duration_min or 0),
+            title=title.strip(), note=note.strip(), phone=(phone or '').strip(), status=st,
+            notified=0, is_active=1, created_at=now, updated_at=now,
+        )
         self.conn.execute(
-            "INSERT INTO appointments(id, client_id, starts_at, duration_min, title, note, phone, status, notified, is_active, created_at, updated_at) "
-            "VALUES(?,?,?,?,?,?,?,?,?,?,?,?)",
-            (appt_id, client_id, starts_at, int(duration_min or 0), title.strip(), note.strip(), (phone or '').strip(), st, 0, 1, now, now),
+            _INSERT_SQL,
+            (ap.id, ap.client_id, ap.starts_at, ap.duration_min, ap.title, ap.note, ap.phone, ap.status, 0, 1, now, now),
         )
         self.conn.commit()
-        ap = self.get_appointment(appt_id)
-        if not ap:
-            raise RuntimeError("Randevu oluşturulamadı.")
+        # All fields are known locally; no read-back SELECT.
         return ap
 
     def update_appointment(
-        self, appt_id: str, *, client_id: str, starts_at: str, duration_min: int, title: str, note: str, phone: str, status: str
+        self, appt_id: str, *, client_id: str, starts_at: str, duration_min: int, title: str, note: str, phone: str, status: str,
+        now_iso: Optional[str] = None,
     ) -> Appointment:
-        now = _now_iso()
-        st = status if status in self.VALID_STATUS else "Planlandı"
+        now = now_iso or _now_iso()
+        st = status if status in self.VALID_STATUS else _DEFAULT_STATUS
         # If the start time changes, reset notification flag so reminders can trigger again.
         old = self.get_appointment(appt_id)
         old_starts = (old.starts_at if old else None)
         new_starts = starts_at
         reset_notified = 1 if (old_starts and old_starts != new_starts) else 0
 
+        ap = Appointment(
+            id=appt_id, client_id=client_id, starts_at=new_starts, duration_min=int(duration_min or 0),
+            title=title.strip(), note=note.strip(), phone=(phone or '').strip(), status=st,
+            is_active=old.is_active if old else 1,
+            created_at=old.created_at if old else "", updated_at=now,
+        )
         self.conn.execute(
-            "UPDATE appointments SET client_id=?, starts_at=?, duration_min=?, title=?, note=?, phone=?, status=?, notified=CASE WHEN ?=1 THEN 0 ELSE notified END, updated_at=? WHERE id=?",
-            (client_id, new_starts, int(duration_min or 0), title.strip(), note.strip(), (phone or '').strip(), st, reset_notified, now, appt_id),
+            _UPDATE_SQL,
+            (ap.client_id, ap.starts_at, ap.duration_min, ap.title, ap.note, ap.phone, st, reset_notified, now, appt_id),
         )
         self.conn.commit()
-        ap = self.get_appointment(appt_id)
-        if not ap:
+        # The row read above (for the notified reset) supplies the fields the
+        # UPDATE does not touch; no read-back SELECT.
+        if old is None:
             raise RuntimeError("Randevu bulunamadı.")
         return ap
 
-    def deactivate_appointment(self, appt_id: str) -> None:
+    def deactivate_appointment(self, appt_id: str, *, now_iso: Optional[str] = None) -> None:
         """Soft delete: keeps record but hides it from UI."""
-        now = _now_iso()
+        now = now_iso or _now_iso()
         self.conn.execute("UPDATE appointments SET is_active=0, updated_at=? WHERE id=?", (now, appt_id))
         self.conn.commit()
 
-    def deactivate_day(self, date_iso: str) -> int:
+    def deactivate_day(self, date_iso: str, *, now_iso: Optional[str] = None) -> int:
         """Soft delete all appointments on a given day (YYYY-MM-DD). Returns affected count."""
         date_iso = (date_iso or "").strip()
         if not date_iso:
             return 0
-        now = _now_iso()
+        now = now_iso or _now_iso()
+        lo, hi = _prefix_range(date_iso)
         cur = self.conn.execute(
-            "UPDATE appointments SET is_active=0, updated_at=? WHERE is_active=1 AND substr(starts_at,1,10)=?",
-            (now, date_iso),
+            "UPDATE appointments SET is_active=0, updated_at=? WHERE is_active=1 AND starts_at >= ? AND starts_at < ?",
+            (now, lo, hi),
         )
         self.conn.commit()
         try:
@@ -176,7 +314,36 @@ class AppointmentsService:
         except Exception:
             return 0
 
-    def copy_day(self, *, from_date: str, to_date: str) -> int:
+    def _copied_rows(self, rows, to_date: str, now: str) -> list[tuple]:
+        """INSERT parameters for copies of `rows` on to_date: keeps times and details,
+        new ids, notified reset to 0."""
+        out = []
+        valid = self.VALID_STATUS
+        for r in rows:
+            # keep time part; starts_at like 'YYYY-MM-DD HH:MM[:SS]' (HH:MM gets ':00')
+            starts = (r["starts_at"] or "").strip()
+            n = len(starts)
+            time_part = starts[11:] if n > 16 else (starts[11:] + ":00" if n == 16 else "00:00:00")
+            st = r["status"]
+            if st not in valid:
+                st = _DEFAULT_STATUS
+            out.append((
+                uuid4().hex,
+                r["client_id"],
+                f"{to_date} {time_part}",
+                int(r["duration_min"] or 0),
+                (r["title"] or ""),
+                (r["note"] or ""),
+                (r["phone"] or ""),
+                st,
+                0,
+                1,
+                now,
+                now,
+            ))
+        return out
+
+    def copy_day(self, *, from_date: str, to_date: str, now_iso: Optional[str] = None) -> int:
         """Copy all active appointments from from_date to to_date (both YYYY-MM-DD).
         Keeps times and details; creates new ids; resets notified to 0. Returns created count.
         """
@@ -187,50 +354,17 @@ class AppointmentsService:
 
         rows = self.conn.execute(
             "SELECT client_id, starts_at, duration_min, title, note, phone, status FROM appointments "
-            "WHERE is_active=1 AND substr(starts_at,1,10)=? ORDER BY starts_at ASC",
-            (from_date,),
+            "WHERE is_active=1 AND starts_at >= ? AND starts_at < ? ORDER BY starts_at ASC",
+            _prefix_range(from_date),
         ).fetchall()
 
-        created = 0
-        now = _now_iso()
-        for r in rows:
-            # keep time part
-            starts = (r["starts_at"] or "").strip()
-            time_part = "00:00:00"
-            if len(starts) >= 16:
-                # starts_at like 'YYYY-MM-DD HH:MM[:SS]'
-                time_part = starts[11:]
-                if len(time_part) == 5:
-                    time_part = time_part + ":00"
-            new_starts = f"{to_date} {time_part}"
-            appt_id = str(uuid4())
-            st = (r["status"] or "Planlandı")
-            if st not in self.VALID_STATUS:
-                st = "Planlandı"
-            self.conn.execute(
-                "INSERT INTO appointments(id, client_id, starts_at, duration_min, title, note, phone, status, notified, is_active, created_at, updated_at) "
-                "VALUES(?,?,?,?,?,?,?,?,?,?,?,?)",
-                (
-                    appt_id,
-                    r["client_id"],
-                    new_starts,
-                    int(r["duration_min"] or 0),
-                    (r["title"] or ""),
-                    (r["note"] or ""),
-                    (_row_get(r, "phone", "") or ""),
-                    st,
-                    0,
-                    1,
-                    now,
-                    now,
-                ),
-            )
-            created += 1
-        if created:
-            self.conn.commit()
-        return created
+        if not rows:
+            return 0
+        with self.conn:
+            self.conn.executemany(_INSERT_SQL, self._copied_rows(rows, to_date, now_iso or _now_iso()))
+        return len(rows)
     
-    def move_day(self, *, from_date: str, to_date: str) -> int:
+    def move_day(self, *, from_date: str, to_date: str, now_iso: Optional[str] = None) -> int:
         """Move (copy then delete source) all active appointments from from_date to to_date.
         Returns moved count. Source appointments are soft-deleted (is_active=0).
         """
@@ -241,77 +375,35 @@ class AppointmentsService:
 
         rows = self.conn.execute(
             "SELECT id, client_id, starts_at, duration_min, title, note, phone, status FROM appointments "
-            "WHERE is_active=1 AND substr(starts_at,1,10)=? ORDER BY starts_at ASC",
-            (from_date,),
+            "WHERE is_active=1 AND starts_at >= ? AND starts_at < ? ORDER BY starts_at ASC",
+            _prefix_range(from_date),
         ).fetchall()
 
         if not rows:
             return 0
 
-        moved = 0
-        now = _now_iso()
-        src_ids = []
+        now = now_iso or _now_iso()
+        src_ids = [r["id"] for r in rows]
         try:
             self.conn.execute("BEGIN")
-            for r in rows:
-                src_ids.append(r["id"])
-                starts = (r["starts_at"] or "").strip()
-                time_part = "00:00:00"
-                if len(starts) >= 16:
-                    time_part = starts[11:]
-                    if len(time_part) == 5:
-                        time_part = time_part + ":00"
-                new_starts = f"{to_date} {time_part}"
-                appt_id = str(uuid4())
-                st = (r["status"] or "Planlandı")
-                if st not in self.VALID_STATUS:
-                    st = "Planlandı"
-                self.conn.execute(
-                    "INSERT INTO appointments(id, client_id, starts_at, duration_min, title, note, phone, status, notified, is_active, created_at, updated_at) "
-                    "VALUES(?,?,?,?,?,?,?,?,?,?,?,?)",
-                    (
-                        appt_id,
-                        r["client_id"],
-                        new_starts,
-                        int(r["duration_min"] or 0),
-                        (r["title"] or ""),
-                        (r["note"] or ""),
-                        (_row_get(r, "phone", "") or ""),
-                        st,
-                        0,
-                        1,
-                        now,
-                        now,
-                    ),
-                )
-                moved += 1
-
+            self.conn.executemany(_INSERT_SQL, self._copied_rows(rows, to_date, now))
             # soft delete source
-            if src_ids:
-                q_marks = ",".join(["?"] * len(src_ids))
-                self.conn.execute(
-                    f"UPDATE appointments SET is_active=0, updated_at=? WHERE id IN ({q_marks})",
-                    (now, *src_ids),
-                )
+            q_marks = ",".join(["?"] * len(src_ids))
+            self.conn.execute(
+                f"UPDATE appointments SET is_active=0, updated_at=? WHERE id IN ({q_marks})",
+                (now, *src_ids),
+            )
             self.conn.commit()
         except Exception:
             self.conn.rollback()
             raise
-        return moved
+        return len(rows)
 
 
     def counts_by_day(self, *, year: int, month: int) -> dict[str, int]:
         """Return {YYYY-MM-DD: count} for the given month (active appointments only)."""
         ym = f"{year:04d}-{month:02d}"
-        rows = self.conn.execute(
-            """
-            SELECT substr(starts_at,1,10) AS d, COUNT(*) AS cnt
-            FROM appointments
-            WHERE is_active=1 AND substr(starts_at,1,7)=?
-            GROUP BY substr(starts_at,1,10)
-            """,
-            (ym,),
-        ).fetchall()
+        rows = self.conn.execute(_COUNTS_BY_DAY_SQL, _prefix_range(ym)).fetchall()
         out: dict[str, int] = {}
         for r in rows:
             out[str(r["d"])] = int(r["cnt"] or 0)
@@ -323,43 +415,26 @@ class AppointmentsService:
         Tooltip shows first `max_items` appointments of that day:
         '09:00 — Ayşe Kaya • Kontrol'
         """
+        return _tooltips_from_lines(self._month_lines(year, month), max_items)
+
+    def month_summary(self, *, year: int, month: int, max_items: int = 5) -> tuple[dict[str, int], dict[str, str]]:
+        """(counts_by_day, tooltips_by_day) for the given month from a single query.
+
+        The calendar needs both; counts are the per-day line counts of the
+        tooltip query (same active-appointment filter), so the month is read once.
+        """
+        by_day = self._month_lines(year, month)
+        counts = {d: len(items) for d, items in by_day.items()}
+        return counts, _tooltips_from_lines(by_day, max_items)
+
+    def _month_lines(self, year: int, month: int) -> dict[str, list[str]]:
         ym = f"{year:04d}-{month:02d}"
-        rows = self.conn.execute(
-            """
-            SELECT substr(a.starts_at,1,10) AS d,
-                   substr(a.starts_at,12,5) AS t,
-                   COALESCE(c.full_name,'') AS client_name,
-                   COALESCE(a.title,'') AS title
-            FROM appointments a
-            LEFT JOIN clients c ON c.id = a.client_id
-            WHERE a.is_active=1 AND substr(a.starts_at,1,7)=?
-            ORDER BY a.starts_at ASC
-            """,
-            (ym,),
-        ).fetchall()
+        rows = self.conn.execute(_TOOLTIPS_BY_DAY_SQL, _prefix_range(ym)).fetchall()
 
         by_day: dict[str, list[str]] = {}
         for r in rows:
-            d = str(r["d"])
-            t = str(r["t"] or "")
-            name = (r["client_name"] or "").strip()
-            title = (r["title"] or "").strip()
-            line = t
-            if name:
-                line += f" — {name}"
-            if title:
-                line += f" • {title}"
-            by_day.setdefault(d, []).append(line)
-
-        out: dict[str, str] = {}
-        for d, items in by_day.items():
-            head = items[: max_items]
-            more = len(items) - len(head)
-            text = "\n".join(head)
-            if more > 0:
-                text += f"\n+{more} randevu daha..."
-            out[d] = text
-        return out
+            by_day.setdefault(r["d"], []).append(r["line"])
+        return by_day
 
     def due_appointments(self, *, window_sec: int = 60, minutes_before: int = 0) -> list[Appointment]:
         """Bildirim için "zamanı gelen" randevuları döndürür.
@@ -377,26 +452,14 @@ class AppointmentsService:
         end = target + timedelta(seconds=int(window_sec))
 
         rows = self.conn.execute(
-            """
-            SELECT a.id,
-                   a.client_id,
-                   substr(a.starts_at, 1, 10) AS date,
-                   substr(a.starts_at, 12, 5) AS time,
-                   a.duration_min,
-                   a.title,
-                   a.note,
-                   a.status,
-                   COALESCE(a.phone,'') AS phone,
-                   COALESCE(c.full_name,'') AS client_name,
-                   a.starts_at
-            FROM appointments a
-            LEFT JOIN clients c ON c.id = a.client_id
-            WHERE a.is_active=1 AND a.notified=0
-              AND datetime(a.starts_at) >= datetime(?)
-              AND datetime(a.starts_at) <  datetime(?)
-            ORDER BY a.starts_at ASC
-            """,
-            (target.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")),
+            _DUE_SQL,
+            (
+                # Kaba aralık (indekslenebilir): pencerenin ilk gününden son gününün
+                # sonuna kadar. Saniyesiz/'T' ayraçlı kayıtlar da bu aralıkta kalır;
+                # kesin filtreyi datetime() karşılaştırması yapar.
+                *_day_span(target.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")),
+                target.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"),
+            ),
         ).fetchall()
 
         out: list[Appointment] = []
@@ -417,6 +480,6 @@ class AppointmentsService:
             )
         return out
 
-    def mark_notified(self, appt_id: str) -> None:
-        self.conn.execute("UPDATE appointments SET notified=1, updated_at=? WHERE id=?", (_now_iso(), appt_id))
+    def mark_notified(self, appt_id: str, *, now_iso: Optional[str] = None) -> None:
+        self.conn.execute("UPDATE appointments SET notified=1, updated_at=? WHERE id=?", (now_iso or _now_iso(), appt_id))
         self.conn.commit()
@@ -15,17 +15,17 @@ def upsert_draft(conn: sqlite3.Connection, key: DraftKey, payload: dict) -> None
     now = datetime.now(timezone.utc).isoformat()
     payload_json = json.dumps(payload, ensure_ascii=False)
 
-    # Aynı entity için tek taslak tutalım (basit/kararlı)
-    conn.execute(
-        """DELETE FROM autosave_drafts
-            WHERE entity_type = ? AND IFNULL(entity_id,'') = IFNULL(?, '')
-              AND IFNULL(client_id,'') = IFNULL(?, '')""",
-        (key.entity_type, key.entity_id, key.client_id),
-    )
-
+    # Aynı entity için tek taslak tutalım (basit/kararlı): idx_autosave_key
+    # UNIQUE index'i sayesinde DELETE + INSERT yerine tek UPSERT.
     conn.execute(
         """INSERT INTO autosave_drafts(entity_type, entity_id, client_id, payload_json, updated_at, app_version)
-            VALUES (?, ?, ?, ?, ?, ?)""",
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(entity_type, IFNULL(entity_id,''), IFNULL(client_id,'')) DO UPDATE SET
+              entity_id = excluded.entity_id,
+              client_id = excluded.client_id,
+              payload_json = excluded.payload_json,
+              updated_at = excluded.updated_at,
+              app_version = excluded.app_version""",
         (key.entity_type, key.entity_id, key.client_id, payload_json, now, APP_VERSION),
     )
     conn.commit()
@@ -1,8 +1,12 @@
+from functools import lru_cache
 from pathlib import Path
 
 DEFAULT_BACKUP_ROOT = Path("C:/nutrinexus_backup")
 
+@lru_cache(maxsize=1)
 def resolve_backup_root() -> Path:
+    # Sonuç süreç boyunca önbelleklenir: yazma testi (mkdir + dosya yaz/sil)
+    # her rapor/PDF üretiminde tekrar yapılmaz.
     # C: yazılamazsa kullanıcı dizinine düş
     try:
         DEFAULT_BACKUP_ROOT.mkdir(parents=True, exist_ok=True)
@@ -48,12 +48,18 @@ class ClientsService:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
         # DB şemasını sürümler arası uyumlu yönetmek için kolonları keşfediyoruz.
-        try:
-            cols = {r[1] for r in self.conn.execute("PRAGMA table_info(clients)").fetchall()}
-        except Exception:
-            cols = set()
-        self._has_created_at = "created_at" in cols
-        self._has_updated_at = "updated_at" in cols
+        # connect_sqlite bağlantıları sonucu taşır; servis her kurulduğunda
+        # PRAGMA tekrar çalışmaz.
+        flags = getattr(conn, "clients_cols", None)
+        if flags is None:
+            try:
+                cols = {r[1] for r in self.conn.execute("PRAGMA table_info(clients)").fetchall()}
+            except Exception:
+                cols = set()
+            flags = ("created_at" in cols, "updated_at" in cols)
+            if hasattr(conn, "clients_cols") and cols:
+                conn.clients_cols = flags
+        self._has_created_at, self._has_updated_at = flags
 
     def list_clients(self, *, only_active: bool = True, query: str | None = None) -> list[Client]:
         q = (query or "").strip().lower()
@@ -81,7 +87,7 @@ class ClientsService:
         return Client(**dict(row)) if row else None
 
     def create_client(self, *, full_name: str, phone: str, birth_date: str, gender: str) -> Client:
-        cid = str(uuid4())
+        cid = uuid4().hex
         now = _now_iso()
         if self._has_created_at and self._has_updated_at:
             self.conn.execute(
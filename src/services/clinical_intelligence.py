@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
@@ -12,50 +14,53 @@ from src.services.settings_service import SettingsService
 # Helpers
 # ---------------------------
 
+# Built once at import: norm_key runs per lab row in lab_insights.
+_TR_MAP = str.maketrans({"ı":"i","İ":"i","ş":"s","Ş":"s","ğ":"g","Ğ":"g","ü":"u","Ü":"u","ö":"o","Ö":"o","ç":"c","Ç":"c"})
+_RE_NONALNUM = re.compile(r"[^a-z0-9]+")
+_RE_WS = re.compile(r"\s+")
+
+# Canonical test key -> known name variants (already stage-1 normalized).
+_ALIASES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("crp", ("c reaktif protein", "c reaktif protein crp", "crp turbidimetrik")),
+    ("hs crp", ()),
+    ("glukoz aclik", ("aclik kan sekeri", "glukoz aclik kan sekeri")),
+    ("glukoz", ()),
+    ("hba1c", ("hb a1c",)),
+    ("25 oh vitamin d", ("vitamin d",)),
+    ("vitamin b12", ("b12",)),
+    ("kolesterol total", ("total kolesterol", "kolesterol")),
+    ("ldl", ("ldl kolesterol",)),
+    ("hdl", ("hdl kolesterol",)),
+    ("trigliserid", ("trigliserit",)),
+    ("alt", ()),
+    ("ast", ()),
+    ("ggt", ()),
+    ("tsh", ()),
+    ("ferritin", ()),
+    ("demir", ()),
+    ("ure", ()),
+    ("kreatinin", ()),
+    ("egfr", ()),
+    ("urik asit", ("uric acid",)),
+    ("hemoglobin", ("hb",)),
+)
+
+# Keyed by token set so word order does not matter
+# ("aclik kan sekeri glukoz" == "glukoz aclik kan sekeri").
+_ALIAS_INDEX: Dict[frozenset, str] = {
+    frozenset(variant.split()): canonical
+    for canonical, variants in _ALIASES
+    for variant in (canonical, *variants)
+}
+
+
+# Test names repeat heavily across imports; a repeated name is a single cache hit.
+@lru_cache(maxsize=4096)
 def norm_key(name: str) -> str:
     """Normalize lab test names for matching / rule lookup."""
-    import re
-    s = (name or "").strip().casefold()
-    tr_map = str.maketrans({"ı":"i","İ":"i","ş":"s","Ş":"s","ğ":"g","Ğ":"g","ü":"u","Ü":"u","ö":"o","Ö":"o","ç":"c","Ç":"c"})
-    s = s.translate(tr_map)
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-
-    synonyms = {
-        "c reaktif protein": "crp",
-        "c reaktif protein crp": "crp",
-        "crp turbidimetrik": "crp",
-        "hs crp": "hs crp",
-        "aclik kan sekeri": "glukoz aclik",
-        "glukoz aclik kan sekeri": "glukoz aclik",
-        "glukoz": "glukoz",
-        "hba1c": "hba1c",
-        "hb a1c": "hba1c",
-        "vitamin d": "25 oh vitamin d",
-        "25 oh vitamin d": "25 oh vitamin d",
-        "b12": "vitamin b12",
-        "vitamin b12": "vitamin b12",
-        "total kolesterol": "kolesterol total",
-        "kolesterol": "kolesterol total",
-        "ldl kolesterol": "ldl",
-        "hdl kolesterol": "hdl",
-        "trigliserid": "trigliserid",
-        "trigliserit": "trigliserid",
-        "alt": "alt",
-        "ast": "ast",
-        "ggt": "ggt",
-        "tsh": "tsh",
-        "ferritin": "ferritin",
-        "demir": "demir",
-        "ure": "ure",
-        "kreatinin": "kreatinin",
-        "egfr": "egfr",
-        "uric acid": "urik asit",
-        "urik asit": "urik asit",
-        "hemoglobin": "hemoglobin",
-        "hb": "hemoglobin",
-    }
-    return synonyms.get(s, s)
+    s = (name or "").strip().casefold().translate(_TR_MAP)
+    s = _RE_WS.sub(" ", _RE_NONALNUM.sub(" ", s)).strip()
+    return _ALIAS_INDEX.get(frozenset(s.split()), s)
 
 
 @dataclass
@@ -110,35 +115,23 @@ class ClinicalIntelligence:
         - result_value, unit, ref_low/ref_high when available
         """
         # Build a map for fast lookup
-        by_key: Dict[str, dict] = {}
-        for r in lab_rows:
-            k = norm_key(r.get("test_name",""))
-            # prefer numeric rows (result_value not None) if duplicates exist
-            if k not in by_key:
-                by_key[k] = r
-            else:
-                cur = by_key[k]
-                if cur.get("result_value") is None and r.get("result_value") is not None:
-                    by_key[k] = r
+        # prefer numeric rows (result_value not None) if duplicates exist:
+        # the stable sort puts numeric rows first, and writing in reverse lets
+        # the first numeric row (else the first row) of each key win.
+        rows_sorted = sorted(lab_rows, key=lambda r: r.get("result_value") is None)
+        by_key: Dict[str, dict] = {norm_key(r.get("test_name","")): r for r in reversed(rows_sorted)}
+        # Flat value/status maps: each rule lookup below is a single dict.get.
+        values: Dict[str, Optional[float]] = {k: r.get("result_value") for k, r in by_key.items()}
+        statuses: Dict[str, str] = {k: (r.get("status") or "unknown") for k, r in by_key.items()}
 
         out: List[Insight] = []
 
         def add(sev: str, title: str, detail: str=""):
             out.append(Insight(severity=sev, title=title, detail=detail))
 
-        def getv(key: str) -> Optional[float]:
-            r = by_key.get(key)
-            if not r:
-                return None
-            return r.get("result_value")
-
-        def status(key: str) -> str:
-            r = by_key.get(key)
-            return (r.get("status") or "unknown") if r else "unknown"
-
         # --- Glycemic ---
-        g = getv("glukoz aclik") or getv("glukoz")
-        a1c = getv("hba1c")
+        g = values.get("glukoz aclik") or values.get("glukoz")
+        a1c = values.get("hba1c")
         if a1c is not None:
             if a1c >= float(self.th.get('hba1c_critical', 6.5)):
                 add("critical", f"HbA1c yüksek ({a1c:.2f}).", "Diyabet aralığı olabilir. Klinik doğrulama ve hekim değerlendirmesi önerilir.")
@@ -158,10 +151,10 @@ class ClinicalIntelligence:
                     add("info", f"Açlık glukozu normal ({g:.0f}).", "Glikoz kontrolü iyi görünüyor.")
 
         # --- Lipids ---
-        ldl = getv("ldl")
-        hdl = getv("hdl")
-        tg = getv("trigliserid")
-        total = getv("kolesterol total")
+        ldl = values.get("ldl")
+        hdl = values.get("hdl")
+        tg = values.get("trigliserid")
+        total = values.get("kolesterol total")
         if ldl is not None and 40 <= ldl <= 250:
             if ldl >= float(self.th.get('ldl_critical', 190.0)):
                 add("critical", f"LDL çok yüksek ({ldl:.0f}).", "Ailevi hiperkolesterolemi dahil riskler için hekim değerlendirmesi gerekir.")
@@ -184,17 +177,17 @@ class ClinicalIntelligence:
                 add("warn", f"Total kolesterol yüksek ({total:.0f}).", "LDL/HDL/TG ile birlikte değerlendirilmelidir.")
 
         # --- Liver ---
-        alt = getv("alt")
-        ast = getv("ast")
-        ggt = getv("ggt")
+        alt = values.get("alt")
+        ast = values.get("ast")
+        ggt = values.get("ggt")
         # Use status if available; numeric thresholds vary by lab. We'll prefer status.
         for key, label in [("alt","ALT"),("ast","AST"),("ggt","GGT")]:
-            st = status(key)
-            v = getv(key)
+            st = statuses.get(key, "unknown")
+            v = values.get(key)
             if st == "high":
                 add("warn", f"{label} yüksek ({'' if v is None else f'{v:.0f}'}).", "Karaciğer yağlanması/alkol/ilaç etkisi gibi nedenler için klinik değerlendirme gerekir.")
         # --- Thyroid ---
-        tsh = getv("tsh")
+        tsh = values.get("tsh")
         if tsh is not None:
             # wide heuristic range
             if tsh >= 10:
@@ -207,11 +200,11 @@ class ClinicalIntelligence:
                 add("warn", f"TSH düşük ({tsh:.2f}).", "Tiroid fonksiyonları için klinik doğrulama önerilir.")
 
         # --- Iron / Vitamins ---
-        ferr = getv("ferritin")
+        ferr = values.get("ferritin")
         if ferr is not None:
             if ferr < 15:
                 add("warn", f"Ferritin düşük ({ferr:.1f}).", "Demir depoları düşük olabilir. Diyet (heme/non-heme demir), C vitamini eşleştirme ve hekim değerlendirmesi düşünülür.")
-        vitd = getv("25 oh vitamin d")
+        vitd = values.get("25 oh vitamin d")
         if vitd is not None:
             if vitd < 10:
                 add("warn", f"Vitamin D çok düşük ({vitd:.1f}).", "Güneşlenme ve hekim kontrolünde destek planı değerlendirilebilir.")
@@ -219,23 +212,23 @@ class ClinicalIntelligence:
                 add("warn", f"Vitamin D düşük ({vitd:.1f}).", "Yeterli güneşlenme ve hekim kontrolünde destek değerlendirilebilir.")
             elif vitd < 30:
                 add("info", f"Vitamin D sınırda ({vitd:.1f}).", "Sürdürülebilir düzey için yaşam tarzı destekleri planlanabilir.")
-        b12 = getv("vitamin b12")
+        b12 = values.get("vitamin b12")
         if b12 is not None and b12 < 200:
             add("warn", f"B12 düşük ({b12:.0f}).", "Hayvansal kaynak alımı, emilim sorunları ve hekim kontrolünde destek planı değerlendirilebilir.")
 
         # --- Inflammation ---
-        crp = getv("crp") or getv("hs crp")
+        crp = values.get("crp") or values.get("hs crp")
         if crp is not None:
-            st = status("crp")
+            st = statuses.get("crp", "unknown")
             if st == "high" or crp > float(self.th.get('crp_warn', 10.0)):
                 add("warn", f"CRP yüksek ({crp:.1f}).", "Akut enfeksiyon/iltihap olabilir. Klinik tablo ile birlikte değerlendirilmelidir.")
 
         # --- Kidney ---
-        kreat = getv("kreatinin")
-        egfr = getv("egfr")
+        kreat = values.get("kreatinin")
+        egfr = values.get("egfr")
         if egfr is not None and egfr < 60:
             add("warn", f"eGFR düşük ({egfr:.0f}).", "Böbrek fonksiyonu için hekim değerlendirmesi gerekir (protein/ilaç/hipertansiyon vb.).")
-        if kreat is not None and status("kreatinin") == "high":
+        if kreat is not None and statuses.get("kreatinin", "unknown") == "high":
             add("warn", f"Kreatinin yüksek ({kreat:.2f}).", "Böbrek fonksiyonu/hidrasyon/ilaçlar ile birlikte değerlendirme önerilir.")
 
         # If nothing triggered, still provide a gentle note if there are rows
@@ -251,7 +244,14 @@ class ClinicalIntelligence:
     # Measurement trend alerts
     # ---------------------------
     def measurement_alerts(self, client_id: str) -> List[Insight]:
-        ms = self.meas.list_for_client(client_id)
+        return self._measurement_alerts_from(self.meas.list_for_client(client_id))
+
+    def measurement_alerts_and_latest(self, client_id: str) -> Tuple[List[Insight], Optional[Measurement]]:
+        """Return (alerts, latest measurement) from a single measurements query."""
+        ms = self.meas.list_for_client(client_id)  # newest first
+        return self._measurement_alerts_from(ms), (ms[0] if ms else None)
+
+    def _measurement_alerts_from(self, ms: List[Measurement]) -> List[Insight]:
         ms = [m for m in ms if (m.weight_kg or 0) > 0]
         if len(ms) < 2:
             return [Insight("info", "Trend analizi için en az 2 ölçüm gerekir.", "Yeni ölçüm girildikçe trend uyarıları otomatik oluşur.")]
@@ -316,10 +316,9 @@ class ClinicalIntelligence:
     # One-glance summary
     # ---------------------------
     def one_glance_summary(self, client_id: str) -> Dict[str, object]:
-        latest_meas = self.meas.latest_for_client(client_id)
+        meas_ins, latest_meas = self.measurement_alerts_and_latest(client_id)
         imp, labs = self.latest_labs(client_id)
         lab_ins = self.lab_insights(labs) if labs else []
-        meas_ins = self.measurement_alerts(client_id)
 
         return {
             "latest_measurement": latest_meas,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import csv
 import sqlite3
+import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -95,14 +96,11 @@ class FoodsCatalogService:
                 log.error(f"TR core catalog CSV not found: {csv_path}")
             return
 
-        # wipe
-        self.conn.execute(f"DELETE FROM {self.TABLE}")
-
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         inserted = 0
 
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+        def _rows(reader):
+            nonlocal inserted
             for row in reader:
                 name = (row.get("name") or "").strip()
                 cat = (row.get("category") or "").strip()
@@ -113,22 +111,29 @@ class FoodsCatalogService:
                     kcal_val = float(kcal)
                 except Exception:
                     kcal_val = 0.0
-
-                # deterministic-ish id
-                food_id = self.conn.execute("SELECT lower(hex(randomblob(16)))").fetchone()[0]
-                self.conn.execute(
-                    f"""INSERT INTO {self.TABLE}
-                    (id,name,kcal_per_100g,is_active,created_at,updated_at,category)
-                    VALUES (?,?,?,?,?,?,?)""",
-                    (food_id, name, kcal_val, 1, now, now, cat),
-                )
                 inserted += 1
-
-        self._meta_set("catalog_source", "Kurumsal TR Çekirdek")
-        self._meta_set("catalog_version", "v2-tr-core")
-        self._meta_set("imported_at", now)
-        self._meta_set("file_hash", "tr-core-v2")
-        self.conn.commit()
+                yield (uuid.uuid4().hex, name, kcal_val, 1, now, now, cat)
+
+        # wipe + insert + meta in one transaction; the INSERT is prepared once
+        # on a single cursor and executemany only binds per row.
+        with open(csv_path, "r", encoding="utf-8") as f, self.conn:
+            cur = self.conn.cursor()
+            cur.execute(f"DELETE FROM {self.TABLE}")
+            cur.executemany(
+                f"""INSERT INTO {self.TABLE}
+                (id,name,kcal_per_100g,is_active,created_at,updated_at,category)
+                VALUES (?,?,?,?,?,?,?)""",
+                _rows(csv.DictReader(f)),
+            )
+            cur.executemany(
+                f"INSERT OR REPLACE INTO {self.META_TABLE} (key,value) VALUES (?,?)",
+                [
+                    ("catalog_source", "Kurumsal TR Çekirdek"),
+                    ("catalog_version", "v2-tr-core"),
+                    ("imported_at", now),
+                    ("file_hash", "tr-core-v2"),
+                ],
+            )
         if log:
             log.info(f"TR core catalog applied: {inserted} rows")
 
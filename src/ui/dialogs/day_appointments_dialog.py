@@ -476,8 +476,9 @@ class DayAppointmentsDialog(QDialog):
             return
 
         # enforce empty target day
-        existing = self.svc.list_appointments(date_from=to_iso, date_to=to_iso, query="")
-        if existing:
+        # only the first row matters; do not materialize the whole day
+        existing = next(self.svc.iter_appointments(date_from=to_iso, date_to=to_iso, query=""), None)
+        if existing is not None:
             ThemedMessageBox.warn(
                 self,
                 "Hedef Gün Dolu",
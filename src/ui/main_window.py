@@ -152,7 +152,16 @@ class MainWindow(QMainWindow):
         self._add_page("Randevularım", AppointmentsScreen(conn=state.conn, log=log))
         self._add_page("Danışanlar", ClientsScreen(state=state, log=log, open_client_detail_cb=self.open_client_detail))
         # FoodsScreen requires DB connection (Sprint 4.8)
-        self._add_page("Besinler", FoodsScreen(conn=state.conn, log=log))
+        # Catalog seeding runs in the background (bootstrap); the screen must not
+        # seed on the GUI connection concurrently, it only refreshes when done.
+        seed_thread = getattr(state, "seed_thread", None)
+        foods_screen = FoodsScreen(conn=state.conn, log=log, seed_catalog=seed_thread is None)
+        self._add_page("Besinler", foods_screen)
+        if seed_thread is not None:
+            seed_thread.seedingFinished.connect(foods_screen.on_catalog_seeded)
+            # Emitted before connect() -> refresh now (may refresh twice; harmless).
+            if seed_thread.done:
+                foods_screen.on_catalog_seeded()
         self._add_page("Şablonlar", TemplatesScreen(conn=state.conn, log=log))
         self._add_page("Ayarlar", SettingsScreen(state=state, log=log))
 
@@ -347,8 +347,7 @@ class AppointmentsScreen(QWidget):
 
     def _refresh_month_marks(self, year: int, month: int):
         """Update premium calendar decorations for the visible month."""
-        counts = self.svc.counts_by_day(year=year, month=month)
-        tooltips = self.svc.tooltips_by_day(year=year, month=month, max_items=5)
+        counts, tooltips = self.svc.month_summary(year=year, month=month, max_items=5)
         self.calendar.set_month_data(counts=counts, tooltips=tooltips)
 
     def _refresh_day_panel(self):
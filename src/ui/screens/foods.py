@@ -31,15 +31,19 @@ class FoodsScreen(QWidget):
     - Büyük katalog güncellemeleri CSV ile içe aktarılır.
     """
 
-    def __init__(self, conn, log=None):
+    def __init__(self, conn, log=None, seed_catalog: bool = True):
         super().__init__()
         self.conn = conn
         self.log = log
         self.svc = FoodsCatalogService(conn)
 
-        # Kurumsal TR çekirdek katalog (assets) otomatik uygulanır (tek kaynak: foods_curated)
-        core_csv = Path(__file__).resolve().parents[2] / "assets" / "data" / "kurumsal_tr_cekirdek_catalog.csv"
-        self.svc.ensure_tr_core_seeded(core_csv, force=True, log=self.log)
+        # Kurumsal TR çekirdek katalog (assets) açılışta arka planda uygulanır
+        # (tek kaynak: foods_curated). Arka plan seed'i varsa burada seed edilmez:
+        # iki bağlantıdan eşzamanlı seed satırları çoğaltır ve GUI'yi kilitte bekletir.
+        # Arka plan seed'i yoksa sadece katalog boşsa/sürümsüzse seed edilir.
+        if seed_catalog:
+            core_csv = Path(__file__).resolve().parents[2] / "assets" / "data" / "kurumsal_tr_cekirdek_catalog.csv"
+            self.svc.ensure_tr_core_seeded(core_csv, force=False, log=self.log)
 
         self._debounce = QTimer(self)
         self._debounce.setInterval(200)
@@ -130,6 +134,11 @@ class FoodsScreen(QWidget):
             parts.append(f"Hash: <span style='font-family: Consolas, monospace;'>{meta.file_hash[:12]}…</span>")
         self.lbl_meta.setText(" · ".join(parts))
 
+    def on_catalog_seeded(self):
+        # Arka plan seed tamamlandı: meta + listeyi yenile
+        self.refresh_meta()
+        self._reset_and_load()
+
     def _do_search(self):
         # debounce target
         self._reset_and_load()
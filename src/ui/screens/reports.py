@@ -6,18 +6,23 @@ from src.services.settings_service import SettingsService
 from datetime import datetime
 import re
 
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QUrl, QObject, Signal
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QPushButton,
     QFileDialog, QMessageBox, QComboBox, QListWidget, QListWidgetItem, QAbstractItemView
 )
 
-from src.reports.pdf_report import build_client_report_pdf
+from src.reports.pdf_report import build_client_report_pdf_async
 from src.app.utils.dates import format_tr_date
 from src.services.backup import resolve_backup_root
 
 
+class _PdfDoneRelay(QObject):
+    """Future worker thread'de tamamlanır; sinyal sonucu GUI thread'e taşır."""
+    done = Signal(object)
+
+
 class ReportsScreen(QWidget):
     """
     Sprint 3.7: Danışan raporu (PDF) ekranı.
@@ -89,6 +94,8 @@ class ReportsScreen(QWidget):
         # Bu yüzden PrimaryBtn kullanıyoruz (QPushButton#PrimaryBtn).
         self.btn_pdf = QPushButton("PDF Rapor Oluştur", objectName="PrimaryBtn")
         self.btn_pdf.clicked.connect(self._export_pdf)
+        self._pdf_relay = _PdfDoneRelay(self)
+        self._pdf_relay.done.connect(self._on_pdf_done)
         row.addWidget(self.btn_pdf)
 
         lay.addLayout(row)
@@ -313,7 +320,9 @@ class ReportsScreen(QWidget):
             adjust = int(self.cmb_goal.currentData())
 
             logo_path = self._get_logo_path()
-            out = build_client_report_pdf(
+            # DB okumaları burada (GUI thread), PDF yerleşimi/yazımı arka planda yapılır;
+            # sonuç _on_pdf_done'a sinyal ile gelir.
+            fut = build_client_report_pdf_async(
                 conn=self.conn,
                 client_id=self.client_id,
                 out_path=path,
@@ -321,6 +330,16 @@ class ReportsScreen(QWidget):
                 activity_factor=activity,
                 goal_adjust_kcal=adjust,
             )
+            self.btn_pdf.setEnabled(False)
+            fut.add_done_callback(self._pdf_relay.done.emit)
+        except Exception as e:
+            self.log.exception("PDF raporu oluşturulamadı: %s", e)
+            QMessageBox.critical(self, "Hata", f"PDF raporu oluşturulamadı.\n\nDetay: {e}")
+
+    def _on_pdf_done(self, fut) -> None:
+        self.btn_pdf.setEnabled(True)
+        try:
+            out = fut.result()
 
             # Arşive kopyala (hızlı görüntüleme için)
             try: